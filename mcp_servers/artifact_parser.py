@@ -47,11 +47,8 @@ class ArtifactMetadata(BaseModel):
 
 def calculate_file_hash(file_path: Path) -> str:
     """Calculate SHA-256 hash of a file"""
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256_hash.update(chunk)
-    return sha256_hash.hexdigest()
+    with open(file_path, "rb", buffering=0) as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 
 def convert_android_timestamp(timestamp: int) -> str:
@@ -73,11 +73,8 @@ def execute_adb_command(args: list[str], timeout: int = 30) -> dict[str, Any]:
 
 def calculate_file_hash(file_path: Path) -> str:
     """Calculate SHA-256 hash of a file"""
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256_hash.update(chunk)
-    return sha256_hash.hexdigest()
+    with open(file_path, "rb", buffering=0) as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 
 def calculate_directory_hash(directory: Path) -> str:
@@ -14,11 +14,20 @@ Provides tools for system-level forensic analysis including:
 import hashlib
 import json
 import os
+import posixpath
 import re
+import shlex
 import subprocess
+import tarfile
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, Field
@@ -33,6 +42,69 @@ mcp = FastMCP(
     """
 )
 
+# Upper bound on concurrent ADB round-trips; more workers only queue up in the adb server
+MAX_ADB_WORKERS = 8
+
+# Integrity hash for captured artifacts. "sha256" (default) matches external tools;
+# "blake2b" is faster on CPUs without SHA extensions. Results are reported under
+# "<algo>_hash" together with "hash_algo" so verifiers know which function to re-run.
+HASH_ALGO = "sha256"
+
+# Read size when streaming command output to disk
+STREAM_CHUNK_SIZE = 1 << 20
+
+# Writable device directory for tar diagnostics. exec-out merges remote stderr into
+# stdout, so it is redirected to a file here and read back after the stream ends
+REMOTE_TMP_DIR = "/data/local/tmp"
+
+# Seconds a mutable (non ro.*) property stays cached
+MUTABLE_PROP_TTL = 30.0
+
+# Seconds a ro.* property stays cached. Fixed within a boot, but bounded so a device
+# reflashed or swapped under the same serial is re-read
+RO_PROP_TTL = 300.0
+
+# getprop intermittently returns nothing on emulators and some devices; retry with
+# exponential backoff (GETPROP_RETRY_BASE * 2**attempt seconds) before giving up
+GETPROP_ATTEMPTS = 3
+GETPROP_RETRY_BASE = 0.1
+
+# (serial, prop) -> (value, expires_at on the time.monotonic() clock)
+_prop_cache: dict[tuple[str, str], tuple[str, float]] = {}
+_prop_cache_lock = threading.Lock()
+
+# One "[key]: [value]" line of a bare `getprop` dump
+_GETPROP_LINE_RE = re.compile(r'^\[([^\]]+)\]: \[(.*)\][ \t\r]*$', re.MULTILINE)
+
+# Section header and version field of `dumpsys package packages`
+_PACKAGE_HEADER_RE = re.compile(r'^\s*Package \[([^\]]+)\]', re.MULTILINE)
+_VERSION_RE = re.compile(r'versionName=([^\s]+)')
+
+# SSID entries in WifiConfigStore.xml / wpa_supplicant.conf
+_SSID_RE = re.compile(r'ssid["\s:=]+([^\s"<>]+)', re.IGNORECASE)
+
+# Account line in `dumpsys account`
+_ACCOUNT_RE = re.compile(r'Account \{name=([^,]+), type=([^}]+)\}')
+
+# Package and process names worth flagging, each matched in a single pass. Search the
+# lowercased name: an IGNORECASE alternation is slower than the per-keyword loop it replaces.
+SUSPICIOUS_PKG_KEYWORDS = ["vpn", "proxy", "tor", "hide", "vault", "secret", "privacy", "secure", "encrypt"]
+_SUSPICIOUS_PKG_RE = re.compile("|".join(map(re.escape, SUSPICIOUS_PKG_KEYWORDS)))
+SUSPICIOUS_PROC_KEYWORDS = ["su", "supersu", "magisk", "daemon", "root", "inject", "hook", "xposed", "frida"]
+_SUSPICIOUS_PROC_RE = re.compile("|".join(map(re.escape, SUSPICIOUS_PROC_KEYWORDS)))
+
+
+def new_hasher():
+    """Create a hash object for the configured HASH_ALGO"""
+    if HASH_ALGO == "blake2b":
+        return hashlib.blake2b(digest_size=32)
+    return hashlib.new(HASH_ALGO)
+
+
+def hash_fields(digest: str) -> dict[str, str]:
+    """Result fields reporting a digest along with the algorithm that produced it"""
+    return {f"{HASH_ALGO}_hash": digest, "hash_algo": HASH_ALGO}
+
 
 def execute_adb_command(args: list[str], device_id: Optional[str] = None, timeout: int = 60) -> dict[str, Any]:
     """Execute ADB command safely with timeout"""
@@ -56,13 +128,328 @@ def execute_adb_command(args: list[str], device_id: Optional[str] = None, timeou
         return {"stdout": "", "stderr": str(e), "returncode": -1, "success": False}
 
 
+def stream_adb_command_to_file(
+    args: list[str],
+    output_path: Path,
+    device_id: Optional[str] = None,
+    timeout: int = 60
+) -> dict[str, Any]:
+    """
+    Stream ADB command stdout straight to a file.
+    Hashes and counts lines in the same pass so the output is never held in memory.
+    """
+    cmd = ["adb"]
+    if device_id:
+        cmd.extend(["-s", device_id])
+    cmd.extend(args)
+    
+    hasher = new_hasher()
+    line_count = 0
+    size = 0
+    last_byte = b"\n"
+    timed_out = threading.Event()
+    try:
+        # stderr goes to a temp file so a chatty stderr can never block the stdout pipe
+        with open(output_path, "wb") as f, tempfile.TemporaryFile() as stderr_file:
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file) as proc:
+                def kill_on_timeout():
+                    timed_out.set()
+                    proc.kill()
+                
+                timer = threading.Timer(timeout, kill_on_timeout)
+                timer.start()
+                try:
+                    for chunk in iter(lambda: proc.stdout.read(STREAM_CHUNK_SIZE), b""):
+                        f.write(chunk)
+                        hasher.update(chunk)
+                        line_count += chunk.count(b"\n")
+                        size += len(chunk)
+                        last_byte = chunk[-1:]
+                    returncode = proc.wait()
+                finally:
+                    timer.cancel()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace")
+    except Exception as e:
+        return {"stderr": str(e), "returncode": -1, "success": False}
+    
+    if timed_out.is_set():
+        return {"stderr": f"Timeout after {timeout}s", "returncode": -1, "success": False}
+    
+    if last_byte != b"\n":
+        line_count += 1  # Final line without trailing newline
+    
+    return {
+        "stderr": stderr,
+        "returncode": returncode,
+        "success": returncode == 0,
+        "command": " ".join(cmd),
+        "line_count": line_count,
+        "size_bytes": size,
+        "hash": hasher.hexdigest()
+    }
+
+
+class _HashingReader:
+    """Read-only stream wrapper that hashes and counts every byte read through it"""
+    
+    def __init__(self, raw):
+        self.raw = raw
+        self.hasher = new_hasher()
+        self.size = 0
+    
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.hasher.update(data)
+        self.size += len(data)
+        return data
+
+
+def _contained_filter(member: tarfile.TarInfo, dest_path: str) -> tarfile.TarInfo:
+    """
+    Extraction filter that refuses paths and links escaping dest_path, strips
+    setuid/setgid and group/other write bits, and never chowns to device owners.
+    The original mode and owner are recorded in the extraction manifest instead.
+    """
+    return tarfile.tar_filter(member, dest_path).replace(
+        uid=None, gid=None, uname=None, gname=None, deep=False
+    )
+
+
+def stream_remote_tar(
+    remote_path: str,
+    local_dir: Path,
+    device_id: Optional[str] = None,
+    timeout: int = 900
+) -> dict[str, Any]:
+    """
+    Archive a remote path with root tar and extract it locally as it streams over adb.
+    The path lands at local_dir/<basename>; the tar stream is hashed for chain of custody.
+    Succeeds only if at least one member was extracted: tar writes end-of-archive
+    padding even when the path is missing, and exec-out does not forward its exit code.
+    exec-out also has no stderr channel, so su and tar diagnostics are redirected to a
+    device-side file and reported as stderr once the stream has ended.
+    """
+    remote_path = remote_path.rstrip("/") or "/"
+    parent, name = posixpath.split(remote_path)
+    tar_cmd = f"tar -cf - -C {shlex.quote(parent or '/')} {shlex.quote(name or '.')}"
+    err_path = shlex.quote(f"{REMOTE_TMP_DIR}/tar-{uuid.uuid4().hex}.err")
+    
+    cmd = ["adb"]
+    if device_id:
+        cmd.extend(["-s", device_id])
+    cmd.extend(["exec-out", f"su -c {shlex.quote(tar_cmd)} 2>{err_path}"])
+    
+    extracted = 0
+    manifest = []
+    skipped = []
+    timed_out = threading.Event()
+    try:
+        with tempfile.TemporaryFile() as stderr_file:
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file) as proc:
+                def kill_on_timeout():
+                    timed_out.set()
+                    proc.kill()
+                
+                timer = threading.Timer(timeout, kill_on_timeout)
+                timer.start()
+                try:
+                    reader = _HashingReader(proc.stdout)
+                    with tarfile.open(fileobj=reader, mode="r|") as tar:
+                        for member in tar:
+                            try:
+                                tar.extract(member, local_dir, filter=_contained_filter)
+                                extracted += 1
+                                manifest.append({
+                                    "path": member.name,
+                                    "mode": oct(member.mode),
+                                    "uid": member.uid,
+                                    "gid": member.gid
+                                })
+                            except (OSError, tarfile.TarError) as e:
+                                skipped.append({"path": member.name, "error": str(e)})
+                    # Drain end-of-archive padding so the hash covers the whole stream
+                    while reader.read(STREAM_CHUNK_SIZE):
+                        pass
+                    returncode = proc.wait()
+                finally:
+                    timer.cancel()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", errors="replace")
+    except Exception as e:
+        return {"stderr": str(e), "returncode": -1, "success": False}
+    finally:
+        remote_err = execute_adb_command(
+            ["shell", f"cat {err_path} 2>/dev/null; rm -f {err_path}"], device_id, timeout=30
+        )
+    
+    if timed_out.is_set():
+        return {"stderr": f"Timeout after {timeout}s", "returncode": -1, "success": False}
+    
+    stderr += remote_err["stdout"]
+    if not extracted:
+        return {
+            "stderr": stderr.strip() or "tar produced no archive members",
+            "returncode": returncode,
+            "success": False,
+            "skipped_members": skipped
+        }
+    
+    return {
+        "stderr": stderr,
+        "returncode": returncode,
+        "success": True,
+        "command": " ".join(cmd),
+        "extracted_members": extracted,
+        "stream_size_bytes": reader.size,
+        "stream_hash": reader.hasher.hexdigest(),
+        "manifest": manifest,
+        "skipped_members": skipped
+    }
+
+
+def run_parallel(tasks: dict[str, Callable[[], Any]]) -> dict[str, Any]:
+    """Run independent device probes concurrently, keyed by probe name"""
+    with ThreadPoolExecutor(max_workers=min(MAX_ADB_WORKERS, len(tasks))) as executor:
+        futures = {name: executor.submit(task) for name, task in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def execute_adb_commands_parallel(
+    probes: dict[str, tuple[list[str], int]],
+    device_id: Optional[str] = None
+) -> dict[str, dict[str, Any]]:
+    """Execute independent ADB commands concurrently, keyed by probe name"""
+    return run_parallel({
+        name: partial(execute_adb_command, args, device_id, timeout)
+        for name, (args, timeout) in probes.items()
+    })
+
+
+def _prop_expiry(prop: str, now: float) -> float:
+    """Cache expiry for a property; ro.* values live longer than mutable ones"""
+    return now + (RO_PROP_TTL if prop.startswith("ro.") else MUTABLE_PROP_TTL)
+
+
+def resolve_serial(device_id: Optional[str] = None) -> Optional[str]:
+    """
+    Serial of the targeted device: device_id itself, or the serial of the single
+    attached device as reported by `adb get-serialno`. None if no device answers.
+    """
+    if device_id:
+        return device_id
+    result = execute_adb_command(["get-serialno"], timeout=10)
+    serial = result["stdout"].strip() if result["success"] else ""
+    return serial if serial and serial != "unknown" else None
+
+
+def get_all_props(device_id: Optional[str] = None) -> Optional[dict[str, str]]:
+    """
+    Dump every system property with a single getprop call.
+    The cache is refreshed only for a known serial; an unreachable device has its
+    cached properties dropped so they are re-read when it reconnects.
+    An empty dump is transient, so it is retried; returns None if no properties were read.
+    """
+    props: dict[str, str] = {}
+    for attempt in range(GETPROP_ATTEMPTS):
+        if attempt:
+            time.sleep(GETPROP_RETRY_BASE * 2 ** (attempt - 1))
+        result = execute_adb_command(["shell", "getprop"], device_id, timeout=15)
+        if not result["success"]:
+            break
+        props = dict(_GETPROP_LINE_RE.findall(result["stdout"]))
+        if props:
+            break
+    
+    if not props:
+        if device_id:
+            clear_device_prop_cache(device_id)
+        return None
+    
+    if device_id:
+        now = time.monotonic()
+        with _prop_cache_lock:
+            for prop, value in props.items():
+                _prop_cache[(device_id, prop)] = (value, _prop_expiry(prop, now))
+    return props
+
+
+def get_device_props(props: list[str], device_id: Optional[str] = None) -> dict[str, Optional[str]]:
+    """
+    Get several system properties, cached per device serial.
+    Without device_id the attached device's serial is resolved first, so a swapped
+    device never sees its predecessor's values; if it cannot be resolved nothing is cached.
+    Any cache miss refreshes all properties with one getprop dump.
+    Unset properties read as "" (like getprop); None means the dump failed.
+    """
+    serial = resolve_serial(device_id)
+    now = time.monotonic()
+    values: dict[str, Optional[str]] = {}
+    if serial:
+        with _prop_cache_lock:
+            for prop in props:
+                cached = _prop_cache.get((serial, prop))
+                if cached and cached[1] > now:
+                    values[prop] = cached[0]
+    
+    missing = [prop for prop in props if prop not in values]
+    if missing:
+        all_props = get_all_props(serial)
+        for prop in missing:
+            values[prop] = None if all_props is None else all_props.get(prop, "")
+        if serial and all_props is not None:
+            now = time.monotonic()
+            with _prop_cache_lock:
+                for prop in missing:
+                    _prop_cache[(serial, prop)] = (values[prop], _prop_expiry(prop, now))
+    return values
+
+
+def get_device_prop(prop: str, device_id: Optional[str] = None) -> Optional[str]:
+    """Get a single system property, cached per device. Returns None if getprop failed."""
+    return get_device_props([prop], device_id)[prop]
+
+
+def clear_device_prop_cache(device_id: Optional[str] = None) -> None:
+    """Invalidate cached properties for a device serial, or for every device if None"""
+    with _prop_cache_lock:
+        for key in [k for k in _prop_cache if device_id is None or k[0] == device_id]:
+            del _prop_cache[key]
+
+
+def parse_package_versions(dumpsys_output: str) -> dict[str, str]:
+    """Map package name to versionName from `dumpsys package packages` output"""
+    headers = list(_PACKAGE_HEADER_RE.finditer(dumpsys_output))
+    versions = {}
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(dumpsys_output)
+        match = _VERSION_RE.search(dumpsys_output, header.end(), end)
+        # First entry wins; later "Hidden system packages" entries are pre-update versions
+        if match and header.group(1) not in versions:
+            versions[header.group(1)] = match.group(1)
+    return versions
+
+
+def directory_stats(directory: Path) -> tuple[int, int]:
+    """Count files and total bytes under a directory in a single scandir pass"""
+    file_count = 0
+    total_size = 0
+    stack = [str(directory)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    file_count += 1
+                    total_size += entry.stat(follow_symlinks=False).st_size
+    return file_count, total_size
+
+
 def calculate_file_hash(file_path: Path) -> str:
-    """Calculate SHA-256 hash of a file"""
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256_hash.update(chunk)
-    return sha256_hash.hexdigest()
+    """Calculate HASH_ALGO digest of a file"""
+    with open(file_path, "rb", buffering=0) as f:
+        return hashlib.file_digest(f, new_hasher).hexdigest()
 
 
 @mcp.tool()
@@ -98,24 +485,19 @@ def capture_logcat(
     if filter_spec:
         args.append(filter_spec)
     
-    result = execute_adb_command(["shell"] + args, device_id, timeout=120)
+    result = stream_adb_command_to_file(["shell"] + args, output_path, device_id, timeout=120)
     
     if result["success"]:
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(result["stdout"])
-        
-        file_hash = calculate_file_hash(output_path)
-        line_count = len(result["stdout"].split("\n"))
-        
         return {
             "success": True,
             "output_file": str(output_path.absolute()),
-            "line_count": line_count,
-            "file_size_bytes": output_path.stat().st_size,
-            "sha256_hash": file_hash,
+            "line_count": result["line_count"],
+            "file_size_bytes": result["size_bytes"],
+            **hash_fields(result["hash"]),
             "timestamp": datetime.now().isoformat()
         }
     else:
+        output_path.unlink(missing_ok=True)
         return {"success": False, "error": result["stderr"]}
 
 
@@ -138,24 +520,23 @@ def capture_dmesg(
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
     # Try without root first
-    result = execute_adb_command(["shell", "dmesg"], device_id, timeout=60)
+    result = stream_adb_command_to_file(["shell", "dmesg"], output_path, device_id, timeout=60)
     
-    if not result["success"] or not result["stdout"].strip():
+    if not result["success"] or not result.get("size_bytes"):
         # Try with root
-        result = execute_adb_command(["shell", "su -c 'dmesg'"], device_id, timeout=60)
+        result = stream_adb_command_to_file(["shell", "su -c 'dmesg'"], output_path, device_id, timeout=60)
     
-    if result["stdout"].strip():
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(result["stdout"])
-        
+    if result.get("size_bytes"):
         return {
             "success": True,
             "output_file": str(output_path.absolute()),
-            "line_count": len(result["stdout"].split("\n")),
-            "sha256_hash": calculate_file_hash(output_path),
+            "line_count": result["line_count"],
+            "file_size_bytes": result["size_bytes"],
+            **hash_fields(result["hash"]),
             "timestamp": datetime.now().isoformat()
         }
     else:
+        output_path.unlink(missing_ok=True)
         return {
             "success": False,
             "error": "Could not capture dmesg",
@@ -186,37 +567,49 @@ def check_root_status(
         "root_verified": False
     }
     
+    # All probes are independent, so issue them concurrently
+    dangerous_props = ["ro.debuggable", "ro.secure"]
+    tasks = {
+        "su_binary": partial(execute_adb_command, ["shell", "which su"], device_id, 10),
+        "root_verified": partial(execute_adb_command, ["shell", "su -c 'id'"], device_id, 10),
+        "magisk": partial(execute_adb_command, ["shell", "ls /data/adb/magisk"], device_id, 10),
+        "supersu_app": partial(execute_adb_command, ["shell", "pm list packages | grep -i supersu"], device_id, 10),
+        "busybox": partial(execute_adb_command, ["shell", "which busybox"], device_id, 10),
+        "packages": partial(execute_adb_command, ["shell", "pm list packages"], device_id, 30),
+        "selinux": partial(execute_adb_command, ["shell", "getenforce"], device_id, 10),
+    }
+    tasks["props"] = partial(get_device_props, ["ro.build.tags"] + dangerous_props, device_id)
+    results = run_parallel(tasks)
+    props = results["props"]
+    
     # Check for su binary
-    result = execute_adb_command(["shell", "which su"], device_id, timeout=10)
+    result = results["su_binary"]
     if result["success"] and result["stdout"].strip():
         root_indicators["su_binary"] = True
     
     # Try to get root
-    result = execute_adb_command(["shell", "su -c 'id'"], device_id, timeout=10)
+    result = results["root_verified"]
     if result["success"] and "uid=0" in result["stdout"]:
         root_indicators["root_verified"] = True
     
     # Check for Magisk
-    result = execute_adb_command(["shell", "ls /data/adb/magisk"], device_id, timeout=10)
+    result = results["magisk"]
     if result["success"] and result["returncode"] == 0:
         root_indicators["magisk"] = True
     
     # Check for SuperSU
-    result = execute_adb_command(
-        ["shell", "pm list packages | grep -i supersu"], 
-        device_id, timeout=10
-    )
+    result = results["supersu_app"]
     if result["success"] and result["stdout"].strip():
         root_indicators["supersu_app"] = True
     
     # Check for busybox
-    result = execute_adb_command(["shell", "which busybox"], device_id, timeout=10)
+    result = results["busybox"]
     if result["success"] and result["stdout"].strip():
         root_indicators["busybox"] = True
     
     # Check root management apps
     root_apps = ["supersu", "magisk", "kingroot", "kingoroot", "rootmaster", "towelroot"]
-    result = execute_adb_command(["shell", "pm list packages"], device_id, timeout=30)
+    result = results["packages"]
     if result["success"]:
         packages = result["stdout"].lower()
         for app in root_apps:
@@ -224,21 +617,19 @@ def check_root_status(
                 root_indicators["root_management_apps"].append(app)
     
     # Check SELinux status
-    result = execute_adb_command(["shell", "getenforce"], device_id, timeout=10)
+    result = results["selinux"]
     if result["success"] and "permissive" in result["stdout"].lower():
         root_indicators["selinux_permissive"] = True
     
     # Check for test-keys
-    result = execute_adb_command(["shell", "getprop ro.build.tags"], device_id, timeout=10)
-    if result["success"] and "test-keys" in result["stdout"]:
+    build_tags = props["ro.build.tags"]
+    if build_tags and "test-keys" in build_tags:
         root_indicators["test_keys"] = True
     
     # Check dangerous properties
-    dangerous_props = ["ro.debuggable", "ro.secure"]
     for prop in dangerous_props:
-        result = execute_adb_command(["shell", f"getprop {prop}"], device_id, timeout=10)
-        if result["success"]:
-            value = result["stdout"].strip()
+        value = props[prop]
+        if value is not None:
             if prop == "ro.debuggable" and value == "1":
                 root_indicators["dangerous_props"].append(f"{prop}={value}")
             elif prop == "ro.secure" and value == "0":
@@ -294,48 +685,42 @@ def get_installed_packages(
         return {"success": False, "error": result["stderr"]}
     
     packages = []
-    for line in result["stdout"].strip().split("\n"):
+    for line in result["stdout"].splitlines():
         if line.startswith("package:"):
-            # Format: package:/path/to/apk=package.name
-            try:
-                path_and_name = line[8:]  # Remove "package:"
-                if "=" in path_and_name:
-                    apk_path, pkg_name = path_and_name.rsplit("=", 1)
-                    packages.append({
-                        "package_name": pkg_name,
-                        "apk_path": apk_path
-                    })
-            except:
-                continue
-    
-    # Get additional info for each package
-    for pkg in packages[:100]:  # Limit for performance
-        # Get version
-        ver_result = execute_adb_command(
-            ["shell", f"dumpsys package {pkg['package_name']} | grep versionName"],
-            device_id, timeout=10
-        )
-        if ver_result["success"]:
-            match = re.search(r'versionName=([^\s]+)', ver_result["stdout"])
-            if match:
-                pkg["version"] = match.group(1)
-        
-        # Get installer
-        inst_result = execute_adb_command(
-            ["shell", f"pm get-install-location {pkg['package_name']}"],
-            device_id, timeout=10
-        )
-        if inst_result["success"]:
-            pkg["install_location"] = inst_result["stdout"].strip()
+            # Format: package:/path/to/apk=package.name (the APK path may itself contain "=")
+            apk_path, sep, pkg_name = line[8:].rpartition("=")
+            if sep:
+                packages.append({
+                    "package_name": pkg_name,
+                    "apk_path": apk_path
+                })
+    
+    # Package details for every package come from two device-wide queries, run concurrently.
+    # `pm get-install-location` ignores any package argument and reports the device default.
+    results = execute_adb_commands_parallel({
+        "dumpsys": (["shell", "dumpsys package packages"], 120),
+        "install_location": (["shell", "pm get-install-location"], 10),
+    }, device_id)
+    
+    versions = {}
+    if results["dumpsys"]["success"]:
+        versions = parse_package_versions(results["dumpsys"]["stdout"])
+    install_location = None
+    if results["install_location"]["success"]:
+        install_location = results["install_location"]["stdout"].strip()
+    
+    for pkg in packages:
+        if pkg["package_name"] in versions:
+            pkg["version"] = versions[pkg["package_name"]]
     
     # Categorize suspicious apps
-    suspicious_keywords = ["vpn", "proxy", "tor", "hide", "vault", "secret", "privacy", "secure", "encrypt"]
-    suspicious_apps = [p for p in packages if any(kw in p["package_name"].lower() for kw in suspicious_keywords)]
+    suspicious_apps = [p for p in packages if _SUSPICIOUS_PKG_RE.search(p["package_name"].lower())]
     
     result_data = {
         "success": True,
         "total_packages": len(packages),
         "third_party_only": not include_system,
+        "install_location": install_location,
         "suspicious_apps": suspicious_apps,
         "suspicious_count": len(suspicious_apps),
         "packages": packages,
@@ -366,20 +751,22 @@ def dump_system_settings(
         output_file: Optional path to save results as JSON
     """
     settings = {}
+    namespaces = ["secure", "system", "global"]
+    results = execute_adb_commands_parallel(
+        {ns: (["shell", f"settings list {ns}"], 30) for ns in namespaces},
+        device_id
+    )
     
-    for namespace in ["secure", "system", "global"]:
-        result = execute_adb_command(
-            ["shell", f"settings list {namespace}"],
-            device_id, timeout=30
-        )
+    for namespace in namespaces:
+        result = results[namespace]
         
         if result["success"]:
-            namespace_settings = {}
-            for line in result["stdout"].strip().split("\n"):
-                if "=" in line:
-                    key, value = line.split("=", 1)
-                    namespace_settings[key] = value
-            settings[namespace] = namespace_settings
+            ns_settings = {}
+            for line in result["stdout"].splitlines():
+                key, sep, value = line.partition("=")
+                if sep:
+                    ns_settings[key] = value
+            settings[namespace] = ns_settings
     
     # Highlight forensically interesting settings
     interesting_settings = {
@@ -425,8 +812,22 @@ def analyze_network_connections(
     """
     network_info = {}
     
+    # All probes are independent, so issue them concurrently
+    tasks = {
+        "netstat": partial(execute_adb_command, ["shell", "netstat -an"], device_id, 30),
+        "ip_config": partial(execute_adb_command, ["shell", "ip addr"], device_id, 30),
+        "wifi_info": partial(execute_adb_command, ["shell", "dumpsys wifi | head -100"], device_id, 30),
+        "saved_networks": partial(
+            execute_adb_command,
+            ["shell", "cat /data/misc/wifi/WifiConfigStore.xml 2>/dev/null || cat /data/misc/wifi/wpa_supplicant.conf 2>/dev/null"],
+            device_id, 30
+        ),
+    }
+    tasks["props"] = partial(get_device_props, ["net.dns1", "net.dns2"], device_id)
+    results = run_parallel(tasks)
+    
     # Get netstat info
-    result = execute_adb_command(["shell", "netstat -an"], device_id, timeout=30)
+    result = results["netstat"]
     if result["success"]:
         connections = []
         for line in result["stdout"].strip().split("\n")[2:]:  # Skip header
@@ -441,33 +842,26 @@ def analyze_network_connections(
         network_info["connections"] = connections
     
     # Get IP configuration
-    result = execute_adb_command(["shell", "ip addr"], device_id, timeout=30)
+    result = results["ip_config"]
     if result["success"]:
         network_info["ip_config"] = result["stdout"]
     
     # Get WiFi info
-    result = execute_adb_command(["shell", "dumpsys wifi | head -100"], device_id, timeout=30)
+    result = results["wifi_info"]
     if result["success"]:
         network_info["wifi_info"] = result["stdout"]
     
     # Get saved WiFi networks
-    result = execute_adb_command(
-        ["shell", "cat /data/misc/wifi/WifiConfigStore.xml 2>/dev/null || cat /data/misc/wifi/wpa_supplicant.conf 2>/dev/null"],
-        device_id, timeout=30
-    )
+    result = results["saved_networks"]
     if result["success"] and result["stdout"].strip():
         # Extract SSIDs
-        ssids = re.findall(r'ssid["\s:=]+([^\s"<>]+)', result["stdout"], re.IGNORECASE)
+        ssids = _SSID_RE.findall(result["stdout"])
         network_info["saved_networks"] = list(set(ssids))
     
     # Get DNS settings
-    result = execute_adb_command(["shell", "getprop net.dns1"], device_id, timeout=10)
-    if result["success"]:
-        network_info["dns1"] = result["stdout"].strip()
-    
-    result = execute_adb_command(["shell", "getprop net.dns2"], device_id, timeout=10)
-    if result["success"]:
-        network_info["dns2"] = result["stdout"].strip()
+    for key, prop in [("dns1", "net.dns1"), ("dns2", "net.dns2")]:
+        if results["props"][prop] is not None:
+            network_info[key] = results["props"][prop]
     
     result_data = {
         "success": True,
@@ -510,23 +904,19 @@ def get_running_processes(
         return {"success": False, "error": result["stderr"]}
     
     processes = []
-    lines = result["stdout"].strip().split("\n")
     
-    # Parse header to get column positions
-    if lines:
-        header = lines[0].split()
-        for line in lines[1:]:
-            parts = line.split()
-            if len(parts) >= 4:
-                processes.append({
-                    "user": parts[0],
-                    "pid": parts[1],
-                    "name": parts[-1]
-                })
+    # Skip the header row; only USER, PID and NAME columns are needed
+    for line in result["stdout"].strip().splitlines()[1:]:
+        parts = line.split()
+        if len(parts) >= 4:
+            processes.append({
+                "user": parts[0],
+                "pid": parts[1],
+                "name": parts[-1]
+            })
     
     # Identify suspicious processes
-    suspicious_keywords = ["su", "supersu", "magisk", "daemon", "root", "inject", "hook", "xposed", "frida"]
-    suspicious = [p for p in processes if any(kw in p["name"].lower() for kw in suspicious_keywords)]
+    suspicious = [p for p in processes if _SUSPICIOUS_PROC_RE.search(p["name"].lower())]
     
     result_data = {
         "success": True,
@@ -577,34 +967,12 @@ def extract_with_root(
     local_dir = Path(local_path)
     local_dir.mkdir(parents=True, exist_ok=True)
     
-    # Use root to copy files to accessible location first
-    temp_path = f"/sdcard/forensic_temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    
-    # Create temp directory
-    execute_adb_command(["shell", f"su -c 'mkdir -p {temp_path}'"], device_id)
-    
-    # Copy with root
-    copy_result = execute_adb_command(
-        ["shell", f"su -c 'cp -r {remote_path} {temp_path}/'"],
-        device_id, timeout=300
-    )
-    
-    if not copy_result["success"]:
-        return {"success": False, "error": f"Root copy failed: {copy_result['stderr']}"}
-    
-    # Pull from temp location
-    pull_result = execute_adb_command(
-        ["pull", temp_path, str(local_dir)],
-        device_id, timeout=600
-    )
-    
-    # Cleanup temp
-    execute_adb_command(["shell", f"su -c 'rm -rf {temp_path}'"], device_id)
+    # Stream a root tar of the path straight to local disk (no intermediate copy on /sdcard)
+    tar_result = stream_remote_tar(remote_path, local_dir, device_id, timeout=900)
     
-    if local_dir.exists():
+    if tar_result["success"]:
         # Calculate stats
-        file_count = sum(1 for f in local_dir.rglob("*") if f.is_file())
-        total_size = sum(f.stat().st_size for f in local_dir.rglob("*") if f.is_file())
+        file_count, total_size = directory_stats(local_dir)
         
         return {
             "success": True,
@@ -613,11 +981,16 @@ def extract_with_root(
             "file_count": file_count,
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
+            f"tar_stream_{HASH_ALGO}_hash": tar_result["stream_hash"],
+            "hash_algo": HASH_ALGO,
+            "manifest": tar_result["manifest"],
+            "skipped_entries": tar_result["skipped_members"],
+            "warnings": tar_result["stderr"].strip() or None,
             "method": "root_extraction",
             "timestamp": datetime.now().isoformat()
         }
     else:
-        return {"success": False, "error": "Pull operation failed"}
+        return {"success": False, "error": f"Root extraction failed: {tar_result['stderr']}"}
 
 
 @mcp.tool()
@@ -709,7 +1082,7 @@ def get_account_info(
     for line in result["stdout"].split("\n"):
         if "Account {" in line:
             # Parse account info
-            match = re.search(r'Account \{name=([^,]+), type=([^}]+)\}', line)
+            match = _ACCOUNT_RE.search(line)
             if match:
                 accounts.append({
                     "name": match.group(1),
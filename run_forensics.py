@@ -10,8 +10,6 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from agents.forensic_agent import ForensicInvestigator, main as agent_main
-
 
 def main():
     """Main entry point."""
@@ -27,6 +25,9 @@ def main():
     ╚═══════════════════════════════════════════════════════════════╝
     """)
     
+    # Imported here so the banner shows before LangGraph and the Gemini client load
+    from agents.forensic_agent import main as agent_main
+    
     asyncio.run(agent_main())
 
 
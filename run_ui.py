@@ -9,8 +9,6 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from ui.app import launch
-
 
 def main():
     """Main entry point for the UI."""
@@ -42,6 +40,9 @@ def main():
     ================================================================
     """)
     
+    # Imported after argument parsing so --help does not load the UI/agent stack
+    from ui.app import launch
+    
     launch(share=args.share, port=args.port)
 
 
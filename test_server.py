@@ -3,13 +3,23 @@ Quick test script for Android Forensics MCP Server
 Run this to verify the server is working correctly
 """
 
+import py_compile
+import shutil
 import subprocess
 import sys
+from importlib.util import find_spec
 
 
 def test_adb_available():
     """Test if ADB is available in system PATH"""
     print("Testing ADB availability...")
+    if shutil.which("adb") is None:
+        print("❌ ADB not found in PATH")
+        print("   Please install Android Platform Tools")
+        print("   Download: https://developer.android.com/tools/releases/platform-tools")
+        return False
+    
+    # adb is present; run it only to report the version
     try:
         result = subprocess.run(
             ["adb", "version"],
@@ -24,11 +34,6 @@ def test_adb_available():
         else:
             print("❌ ADB command failed")
             return False
-    except FileNotFoundError:
-        print("❌ ADB not found in PATH")
-        print("   Please install Android Platform Tools")
-        print("   Download: https://developer.android.com/tools/releases/platform-tools")
-        return False
     except Exception as e:
         print(f"❌ Error testing ADB: {e}")
         return False
@@ -56,15 +61,20 @@ def test_imports():
         ("pydantic", "BaseModel"),
     ]
     
+    # Locate the modules without executing them; presence is enough here
     all_ok = True
     for module_name, class_name in required_modules:
         try:
-            module = __import__(module_name, fromlist=[class_name])
-            getattr(module, class_name)
-            print(f"✅ {module_name}.{class_name}")
-        except ImportError as e:
+            spec = find_spec(module_name)
+        except ImportError as e:  # a parent package is missing
             print(f"❌ {module_name}.{class_name}: {e}")
             all_ok = False
+            continue
+        if spec is None:
+            print(f"❌ {module_name}.{class_name}: module not found")
+            all_ok = False
+        else:
+            print(f"✅ {module_name}.{class_name}")
     
     return all_ok
 
@@ -73,12 +83,11 @@ def test_server_syntax():
     """Test if main.py has valid syntax"""
     print("\nTesting main.py syntax...")
     try:
-        with open("main.py", "r") as f:
-            code = f.read()
-        compile(code, "main.py", "exec")
+        # Leaves the bytecode in __pycache__ for the server's own import to reuse
+        py_compile.compile("main.py", doraise=True)
         print("✅ main.py syntax is valid")
         return True
-    except SyntaxError as e:
+    except py_compile.PyCompileError as e:
         print(f"❌ Syntax error in main.py: {e}")
         return False
     except Exception as e:
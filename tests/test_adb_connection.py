@@ -6,23 +6,68 @@ Comprehensive tests for verifying ADB connectivity and
 forensic operation execution capabilities.
 """
 
+import asyncio
 import json
 import os
+import re
+import shutil
 import subprocess
 import sys
+import threading
 import time
 import unittest
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# Faster JSON encoder for reports, if installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# Banner line of `adb version`
+_VERSION_RE = re.compile(r'Android Debug Bridge.*')
+
+# "[key]: [value]" line of a bare `getprop` dump
+_GETPROP_RE = re.compile(r'\[([^\]]+)\]:\s*\[([^\]]*)\]')
+
+# Online entry of `adb devices -l`: "<serial>  device ..."
+_DEVICE_RE = re.compile(r'^(\S+)\s+device\b')
+
+# Marker echoed after each command sent to the persistent shell
+_SHELL_SENTINEL = "__END__"
+
+# Maximum number of post-connection checks talking to adb at once
+MAX_CONCURRENT_CHECKS = 4
+
+
+def _decode_output(data: bytes) -> str:
+    """Decode adb output, taking the ASCII fast path when possible."""
+    data = data.strip()
+    if data.isascii():
+        return data.decode("ascii")
+    return data.decode("utf-8", errors="replace")
+
 
 class ADBTestResult:
-    """Container for ADB test results."""
+    """
+    Container for ADB test results.
+    
+    Declares __slots__ so each verifier's result stays compact. to_dict()
+    builds the report on demand; it is serialized once per run.
+    """
+    
+    __slots__ = (
+        "adb_available", "adb_version", "device_connected", "device_id",
+        "device_info", "tests_passed", "tests_failed", "warnings",
+        "timestamp",
+    )
     
     def __init__(self):
         self.adb_available = False
@@ -35,6 +80,27 @@ class ADBTestResult:
         self.warnings = []
         self.timestamp = datetime.now().isoformat()
     
+    def set_adb(self, available: bool, version: Optional[str] = None):
+        self.adb_available = available
+        if version is not None:
+            self.adb_version = version
+    
+    def set_device(self, device_id: Optional[str]):
+        self.device_id = device_id
+        self.device_connected = device_id is not None
+    
+    def add_pass(self, test_name: str):
+        self.tests_passed.append(test_name)
+    
+    def add_failure(self, test_name: str):
+        self.tests_failed.append(test_name)
+    
+    def add_warning(self, message: str):
+        self.warnings.append(message)
+    
+    def update_device_info(self, info: dict):
+        self.device_info.update(info)
+    
     def to_dict(self) -> dict:
         return {
             "timestamp": self.timestamp,
@@ -63,21 +129,53 @@ class ADBConnectionVerifier:
     
     This class performs comprehensive checks on ADB availability,
     device connection status, and basic forensic operations.
+    
+    The adb server is started once when the verifier is created, so
+    individual checks never pay the daemon cold-start. The server is left
+    running for the rest of the session.
     """
     
-    def __init__(self, timeout: int = 10):
+    def __init__(self, timeout: int = 10, device_id: Optional[str] = None):
         self.timeout = timeout
         self.result = ADBTestResult()
+        # A known serial (argument or ANDROID_SERIAL) skips the device scan
+        self.serial = device_id or os.environ.get("ANDROID_SERIAL") or None
+        # Failures surface in check_adb_installation; nothing to report here
+        self.run_adb_command(["start-server"], want_stderr=False)
+        self._shell: Optional[subprocess.Popen] = None
+        self._shell_lock = threading.Lock()
+    
+    def __del__(self):
+        self.close()
+    
+    def close(self):
+        """Terminate the persistent device shell, if one is open."""
+        shell, self._shell = getattr(self, "_shell", None), None
+        if shell is None:
+            return
+        try:
+            shell.stdin.close()
+        except OSError:
+            pass
+        try:
+            shell.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            shell.kill()
+            shell.wait()
     
     def run_adb_command(
         self, 
         args: list, 
         device_id: Optional[str] = None,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        want_stderr: bool = True
     ) -> tuple[bool, str, str]:
         """
         Execute an ADB command and return results.
         
+        Callers that only look at success or stdout can pass
+        want_stderr=False to discard stderr instead of buffering it.
+        
         Returns:
             Tuple of (success, stdout, stderr)
         """
@@ -89,14 +187,14 @@ class ADBConnectionVerifier:
         try:
             result = subprocess.run(
                 cmd,
-                capture_output=True,
-                text=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE if want_stderr else subprocess.DEVNULL,
                 timeout=timeout or self.timeout
             )
             return (
                 result.returncode == 0,
-                result.stdout.strip(),
-                result.stderr.strip()
+                _decode_output(result.stdout),
+                _decode_output(result.stderr) if want_stderr else ""
             )
         except subprocess.TimeoutExpired:
             return False, "", "Command timed out"
@@ -105,60 +203,195 @@ class ADBConnectionVerifier:
         except Exception as e:
             return False, "", str(e)
     
+    def run_shell(self, command: str, timeout: Optional[int] = None) -> tuple[bool, str, str]:
+        """
+        Run a command in a persistent `adb shell` session.
+        
+        Avoids spawning a new adb client and device shell for every
+        command. The session is opened on first use and reopened if it dies.
+        
+        Returns:
+            Tuple of (success, stdout, stderr)
+        """
+        with self._shell_lock:
+            return self._run_shell(command, timeout)
+    
+    def _run_shell(self, command: str, timeout: Optional[int] = None) -> tuple[bool, str, str]:
+        if self._shell is None or self._shell.poll() is not None:
+            cmd = ["adb"]
+            if self.result.device_id:
+                cmd.extend(["-s", self.result.device_id])
+            cmd.append("shell")
+            try:
+                self._shell = subprocess.Popen(
+                    cmd,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1
+                )
+            except FileNotFoundError:
+                return False, "", "ADB not found in PATH"
+            except Exception as e:
+                return False, "", str(e)
+        
+        shell = self._shell
+        timed_out = threading.Event()
+        
+        def kill_on_timeout():
+            timed_out.set()
+            shell.kill()
+        
+        timer = threading.Timer(timeout or self.timeout, kill_on_timeout)
+        timer.start()
+        try:
+            shell.stdin.write(f"{command}; echo {_SHELL_SENTINEL}$?\n")
+            shell.stdin.flush()
+            
+            output = []
+            for line in shell.stdout:
+                # Output without a trailing newline shares a line with the marker
+                head, marker, rc = line.rpartition(_SHELL_SENTINEL)
+                if marker:
+                    if head:
+                        output.append(head)
+                    return rc.strip() == "0", "".join(output).strip(), ""
+                output.append(line)
+        except OSError as e:
+            self.close()
+            return False, "", str(e)
+        finally:
+            timer.cancel()
+        
+        # stdout hit EOF: the shell exited or was killed by the timer
+        self.close()
+        return False, "", "Command timed out" if timed_out.is_set() else "Shell session closed"
+    
+    async def run_adb_command_async(
+        self,
+        args: list,
+        device_id: Optional[str] = None,
+        timeout: Optional[int] = None
+    ) -> tuple[bool, str, str]:
+        """
+        Execute an ADB command without blocking the event loop.
+        
+        Returns:
+            Tuple of (success, stdout, stderr)
+        """
+        cmd = ["adb"]
+        if device_id:
+            cmd.extend(["-s", device_id])
+        cmd.extend(args)
+        
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except FileNotFoundError:
+            return False, "", "ADB not found in PATH"
+        except Exception as e:
+            return False, "", str(e)
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return False, "", "Command timed out"
+        
+        return (
+            proc.returncode == 0,
+            _decode_output(stdout),
+            _decode_output(stderr)
+        )
+    
     def check_adb_installation(self) -> bool:
         """Verify ADB is installed and accessible."""
-        success, stdout, stderr = self.run_adb_command(["version"])
+        # PATH lookup avoids spawning a process when adb is missing
+        adb = shutil.which("adb")
+        if adb is None:
+            self.result.set_adb(False)
+            self.result.add_failure("adb_installation")
+            return False
+        
+        success, stdout, stderr = _adb_version(adb, self.timeout)
         
         if success:
-            self.result.adb_available = True
             # Extract version info
-            for line in stdout.split("\n"):
-                if "Android Debug Bridge" in line:
-                    self.result.adb_version = line.strip()
-                    break
-            self.result.tests_passed.append("adb_installation")
+            match = _VERSION_RE.search(stdout)
+            self.result.set_adb(True, match.group(0).strip() if match else None)
+            self.result.add_pass("adb_installation")
             return True
         else:
-            self.result.adb_available = False
-            self.result.tests_failed.append("adb_installation")
+            self.result.set_adb(False)
+            self.result.add_failure("adb_installation")
             return False
     
     def check_device_connection(self) -> bool:
         """Check if any Android device is connected."""
         if not self.result.adb_available:
-            self.result.tests_failed.append("device_connection")
+            self.result.add_failure("device_connection")
+            return False
+        
+        if self.result.device_connected:
+            return True
+        
+        if self.serial:
+            # Probe the known device instead of listing every device
+            success, stdout, stderr = self.run_adb_command(
+                ["get-state"],
+                device_id=self.serial,
+                want_stderr=False
+            )
+            if success and stdout == "device":
+                self.result.set_device(self.serial)
+                self.result.add_pass("device_connection")
+                return True
+            self.result.add_failure("device_connection")
             return False
         
+        # With a single device attached, adb reports its state and serial
+        # directly; it refuses when several are attached
+        success, state, stderr = self.run_adb_command(["get-state"], want_stderr=False)
+        if success and state == "device":
+            success, serial, stderr = self.run_adb_command(["get-serialno"], want_stderr=False)
+            if success and serial:
+                self.result.set_device(serial)
+                self.result.add_pass("device_connection")
+                return True
+        
         success, stdout, stderr = self.run_adb_command(["devices", "-l"])
         
         if not success:
-            self.result.tests_failed.append("device_connection")
+            self.result.add_failure("device_connection")
             return False
         
-        # Parse device list
-        lines = stdout.strip().split("\n")[1:]  # Skip header
-        devices = []
-        
-        for line in lines:
-            if line.strip() and "device" in line and "offline" not in line:
-                parts = line.split()
-                if len(parts) >= 2:
-                    device_id = parts[0]
-                    if parts[1] == "device":
-                        devices.append(device_id)
-        
-        if devices:
-            self.result.device_connected = True
-            self.result.device_id = devices[0]  # Use first device
-            self.result.tests_passed.append("device_connection")
+        # Parse device list; stop at the first online device
+        device_id = None
+        for line in stdout.splitlines()[1:]:  # Skip header
+            match = _DEVICE_RE.match(line)
+            if match:
+                device_id = match.group(1)
+                break
+        
+        self.result.set_device(device_id)
+        if device_id:
+            self.result.add_pass("device_connection")
             return True
         else:
-            self.result.device_connected = False
-            self.result.tests_failed.append("device_connection")
+            self.result.add_failure("device_connection")
             return False
     
     def get_device_properties(self) -> dict:
         """Retrieve device properties via ADB."""
+        return asyncio.run(self.get_device_properties_async())
+    
+    async def get_device_properties_async(self) -> dict:
+        """Retrieve device properties via ADB with a single getprop dump."""
         if not self.result.device_connected:
             return {}
         
@@ -176,133 +409,173 @@ class ADBConnectionVerifier:
             ("bootloader", "ro.bootloader"),
         ]
         
+        success, stdout, stderr = await self.run_adb_command_async(
+            ["shell", "getprop"],
+            device_id=self.result.device_id
+        )
+        all_props = dict(_GETPROP_RE.findall(stdout)) if success else {}
+        
         for key, prop in prop_names:
-            success, stdout, stderr = self.run_adb_command(
-                ["shell", "getprop", prop],
-                device_id=self.result.device_id
-            )
             if success:
-                props[key] = stdout or "N/A"
+                props[key] = all_props.get(prop) or "N/A"
             else:
                 props[key] = "ERROR"
         
-        self.result.device_info = props
+        # Merge rather than replace: check_root_status may run concurrently
+        self.result.update_device_info(props)
         return props
     
     def check_shell_access(self) -> bool:
         """Verify shell access to device."""
         if not self.result.device_connected:
-            self.result.tests_failed.append("shell_access")
+            self.result.add_failure("shell_access")
             return False
         
-        success, stdout, stderr = self.run_adb_command(
-            ["shell", "echo", "ADB_TEST_SUCCESS"],
-            device_id=self.result.device_id
-        )
+        success, stdout, stderr = self.run_shell("echo ADB_TEST_SUCCESS")
         
         if success and "ADB_TEST_SUCCESS" in stdout:
-            self.result.tests_passed.append("shell_access")
+            self.result.add_pass("shell_access")
             return True
         else:
-            self.result.tests_failed.append("shell_access")
+            self.result.add_failure("shell_access")
             return False
     
     def check_package_manager(self) -> bool:
         """Verify package manager access."""
         if not self.result.device_connected:
-            self.result.tests_failed.append("package_manager")
+            self.result.add_failure("package_manager")
             return False
         
-        success, stdout, stderr = self.run_adb_command(
-            ["shell", "pm", "list", "packages", "-s"],
-            device_id=self.result.device_id,
-            timeout=30
-        )
+        success, stdout, stderr = self.run_shell("pm list packages -s", timeout=30)
         
         if success and "package:" in stdout:
-            self.result.tests_passed.append("package_manager")
+            self.result.add_pass("package_manager")
             return True
         else:
-            self.result.tests_failed.append("package_manager")
+            self.result.add_failure("package_manager")
             return False
     
     def check_logcat_access(self) -> bool:
         """Verify logcat access."""
         if not self.result.device_connected:
-            self.result.tests_failed.append("logcat_access")
+            self.result.add_failure("logcat_access")
             return False
         
         success, stdout, stderr = self.run_adb_command(
-            ["logcat", "-d", "-t", "10"],
+            ["logcat", "-d", "-t", "1"],
             device_id=self.result.device_id,
-            timeout=15
+            timeout=15,
+            want_stderr=False
         )
         
         if success:
-            self.result.tests_passed.append("logcat_access")
+            self.result.add_pass("logcat_access")
             return True
         else:
-            self.result.tests_failed.append("logcat_access")
+            self.result.add_failure("logcat_access")
             return False
     
     def check_file_system_access(self) -> bool:
         """Verify file system access (limited without root)."""
         if not self.result.device_connected:
-            self.result.tests_failed.append("filesystem_access")
+            self.result.add_failure("filesystem_access")
             return False
         
         # Try to list /sdcard (usually accessible)
-        success, stdout, stderr = self.run_adb_command(
-            ["shell", "ls", "/sdcard"],
-            device_id=self.result.device_id
-        )
+        success, stdout, stderr = self.run_shell("ls /sdcard")
         
         if success:
-            self.result.tests_passed.append("filesystem_access")
+            self.result.add_pass("filesystem_access")
             return True
         else:
-            self.result.warnings.append("Limited filesystem access - /sdcard not accessible")
-            self.result.tests_failed.append("filesystem_access")
+            self.result.add_warning("Limited filesystem access - /sdcard not accessible")
+            self.result.add_failure("filesystem_access")
             return False
     
-    def check_root_status(self) -> bool:
-        """Check if device is rooted."""
+    def check_root_status(self) -> Optional[bool]:
+        """Check if device is rooted. Returns None if a probe timed out or failed to run."""
         if not self.result.device_connected:
             return False
         
-        # Try su command
-        success, stdout, stderr = self.run_adb_command(
-            ["shell", "su", "-c", "id"],
+        # Look for an su binary first; invoking a missing or unmanaged su
+        # can stall for seconds on unrooted devices
+        found, su_path, stderr = self.run_adb_command(
+            ["shell", "command -v su 2>/dev/null"],
             device_id=self.result.device_id,
-            timeout=5
+            want_stderr=False
         )
         
+        success, stdout = False, ""
+        if found and su_path.startswith("/"):
+            success, stdout, stderr = self.run_adb_command(
+                ["shell", "su", "-c", "id"],
+                device_id=self.result.device_id,
+                timeout=5,
+                want_stderr=False
+            )
+        
+        # stderr is discarded, so it is only set when a probe timed out or adb failed to run
+        if stderr:
+            self.result.update_device_info({"rooted": None})
+            self.result.add_warning(f"Root status unknown - {stderr}")
+            self.result.add_failure("root_check")
+            return None
+        
         if success and "uid=0" in stdout:
-            self.result.device_info["rooted"] = True
-            self.result.tests_passed.append("root_check")
+            self.result.update_device_info({"rooted": True})
+            self.result.add_pass("root_check")
             return True
         else:
-            self.result.device_info["rooted"] = False
-            self.result.warnings.append("Device is not rooted - some forensic operations may be limited")
-            self.result.tests_passed.append("root_check")  # Test completed, not failed
+            self.result.update_device_info({"rooted": False})
+            self.result.add_warning("Device is not rooted - some forensic operations may be limited")
+            self.result.add_pass("root_check")  # Test completed, not failed
             return False
     
     def check_backup_capability(self) -> bool:
         """Check if backup operations are possible."""
         if not self.result.device_connected:
-            self.result.tests_failed.append("backup_capability")
+            self.result.add_failure("backup_capability")
             return False
         
         # Check if backup is allowed
         success, stdout, stderr = self.run_adb_command(
             ["shell", "settings", "get", "global", "adb_backup_enabled"],
-            device_id=self.result.device_id
+            device_id=self.result.device_id,
+            want_stderr=False
         )
         
         # Note: This may not work on all devices
-        self.result.tests_passed.append("backup_capability")
+        self.result.add_pass("backup_capability")
         return True
     
+    async def run_device_checks_async(self) -> tuple:
+        """
+        Run the post-connection checks concurrently.
+        
+        Blocking checks run in worker threads, at most
+        MAX_CONCURRENT_CHECKS at a time. Commands on the persistent shell
+        are still serialized by its lock.
+        
+        Returns:
+            Tuple of (properties, shell, package_manager, logcat,
+            filesystem, rooted, backup) results
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_CHECKS)
+        
+        async def limited(coro):
+            async with semaphore:
+                return await coro
+        
+        return tuple(await asyncio.gather(
+            limited(self.get_device_properties_async()),
+            limited(asyncio.to_thread(self.check_shell_access)),
+            limited(asyncio.to_thread(self.check_package_manager)),
+            limited(asyncio.to_thread(self.check_logcat_access)),
+            limited(asyncio.to_thread(self.check_file_system_access)),
+            limited(asyncio.to_thread(self.check_root_status)),
+            limited(asyncio.to_thread(self.check_backup_capability)),
+        ))
+    
     def run_all_checks(self) -> ADBTestResult:
         """Run all verification checks."""
         print("Starting ADB verification tests...\n")
@@ -323,9 +596,13 @@ class ADBConnectionVerifier:
             print("FAIL - No device connected")
             return self.result
         
+        # The remaining checks are independent of each other
+        (props, shell_ok, pm_ok, logcat_ok, fs_ok, rooted, backup_ok) = asyncio.run(
+            self.run_device_checks_async()
+        )
+        
         # Device Properties
         print("[3/9] Retrieving device properties...", end=" ")
-        props = self.get_device_properties()
         if props:
             print(f"PASS - {props.get('manufacturer', 'Unknown')} {props.get('model', 'Unknown')}")
         else:
@@ -333,58 +610,88 @@ class ADBConnectionVerifier:
         
         # Shell Access
         print("[4/9] Checking shell access...", end=" ")
-        if self.check_shell_access():
-            print("PASS")
-        else:
-            print("FAIL")
+        print("PASS" if shell_ok else "FAIL")
         
         # Package Manager
         print("[5/9] Checking package manager access...", end=" ")
-        if self.check_package_manager():
-            print("PASS")
-        else:
-            print("FAIL")
+        print("PASS" if pm_ok else "FAIL")
         
         # Logcat Access
         print("[6/9] Checking logcat access...", end=" ")
-        if self.check_logcat_access():
-            print("PASS")
-        else:
-            print("FAIL")
+        print("PASS" if logcat_ok else "FAIL")
         
         # Filesystem Access
         print("[7/9] Checking filesystem access...", end=" ")
-        if self.check_file_system_access():
-            print("PASS")
-        else:
-            print("LIMITED")
+        print("PASS" if fs_ok else "LIMITED")
         
         # Root Status
         print("[8/9] Checking root status...", end=" ")
-        if self.check_root_status():
-            print("ROOTED")
-        else:
-            print("NOT ROOTED")
+        print("UNKNOWN" if rooted is None else "ROOTED" if rooted else "NOT ROOTED")
         
         # Backup Capability
         print("[9/9] Checking backup capability...", end=" ")
-        if self.check_backup_capability():
-            print("PASS")
-        else:
-            print("UNKNOWN")
+        print("PASS" if backup_ok else "UNKNOWN")
         
+        self.close()
         return self.result
 
 
+# adb path -> `adb version` output; only successful runs are remembered
+_adb_versions: dict[str, str] = {}
+
+
+def _adb_version(adb: str, timeout: int) -> tuple[bool, str, str]:
+    """
+    Run `adb version`, reusing the first successful answer for this
+    binary; the client does not change within a process. Failures are
+    not cached, so a later check retries.
+    
+    Returns:
+        Tuple of (success, stdout, stderr)
+    """
+    if adb in _adb_versions:
+        return True, _adb_versions[adb], ""
+    try:
+        result = subprocess.run([adb, "version"], capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return False, "", "Command timed out"
+    except Exception as e:
+        return False, "", str(e)
+    
+    stdout = _decode_output(result.stdout)
+    if result.returncode != 0:
+        return False, stdout, _decode_output(result.stderr)
+    _adb_versions[adb] = stdout
+    return True, stdout, ""
+
+
+_shared_verifier: Optional[ADBConnectionVerifier] = None
+
+
+def get_shared_verifier() -> ADBConnectionVerifier:
+    """
+    Return a verifier shared by the test classes.
+    
+    Only the installation and connection checks run, once per session.
+    The tests issue their own adb commands, so nothing else is needed up
+    front.
+    """
+    global _shared_verifier
+    if _shared_verifier is None:
+        verifier = ADBConnectionVerifier()
+        verifier.check_adb_installation()
+        verifier.check_device_connection()
+        _shared_verifier = verifier
+    return _shared_verifier
+
+
 class TestADBConnection(unittest.TestCase):
     """Unit tests for ADB connection functionality."""
     
     @classmethod
     def setUpClass(cls):
         """Set up test fixtures."""
-        cls.verifier = ADBConnectionVerifier()
-        cls.verifier.check_adb_installation()
-        cls.verifier.check_device_connection()
+        cls.verifier = get_shared_verifier()
     
     def test_adb_available(self):
         """Test that ADB is available."""
@@ -449,22 +756,37 @@ class TestADBConnection(unittest.TestCase):
 class TestForensicOperations(unittest.TestCase):
     """Test forensic-specific operations."""
     
+    # Independent probes, run concurrently once for the whole class
+    PROBES = {
+        "packages": (["shell", "pm", "list", "packages"], 30),
+        "logcat": (["logcat", "-d", "-t", "1"], 15),
+        "sdcard": (["shell", "ls", "/sdcard"], None),
+        "dumpsys": (["shell", "dumpsys", "activity", "activities"], 30),
+    }
+    
     @classmethod
     def setUpClass(cls):
         """Set up test fixtures."""
-        cls.verifier = ADBConnectionVerifier()
-        cls.verifier.run_all_checks()
+        cls.verifier = get_shared_verifier()
+        cls.probe_results = {}
+        if cls.verifier.result.device_connected:
+            cls.probe_results = asyncio.run(cls._run_probes())
+    
+    @classmethod
+    async def _run_probes(cls) -> dict:
+        device_id = cls.verifier.result.device_id
+        results = await asyncio.gather(*[
+            cls.verifier.run_adb_command_async(args, device_id=device_id, timeout=timeout)
+            for args, timeout in cls.PROBES.values()
+        ])
+        return dict(zip(cls.PROBES, results))
     
     def test_package_list_retrieval(self):
         """Test that package list can be retrieved."""
         if not self.verifier.result.device_connected:
             self.skipTest("No device connected")
         
-        success, stdout, stderr = self.verifier.run_adb_command(
-            ["shell", "pm", "list", "packages"],
-            device_id=self.verifier.result.device_id,
-            timeout=30
-        )
+        success, stdout, stderr = self.probe_results["packages"]
         
         self.assertTrue(success)
         self.assertIn("package:", stdout)
@@ -474,11 +796,7 @@ class TestForensicOperations(unittest.TestCase):
         if not self.verifier.result.device_connected:
             self.skipTest("No device connected")
         
-        success, stdout, stderr = self.verifier.run_adb_command(
-            ["logcat", "-d", "-t", "5"],
-            device_id=self.verifier.result.device_id,
-            timeout=15
-        )
+        success, stdout, stderr = self.probe_results["logcat"]
         
         self.assertTrue(success)
     
@@ -487,10 +805,7 @@ class TestForensicOperations(unittest.TestCase):
         if not self.verifier.result.device_connected:
             self.skipTest("No device connected")
         
-        success, stdout, stderr = self.verifier.run_adb_command(
-            ["shell", "ls", "/sdcard"],
-            device_id=self.verifier.result.device_id
-        )
+        success, stdout, stderr = self.probe_results["sdcard"]
         
         self.assertTrue(success)
     
@@ -499,11 +814,7 @@ class TestForensicOperations(unittest.TestCase):
         if not self.verifier.result.device_connected:
             self.skipTest("No device connected")
         
-        success, stdout, stderr = self.verifier.run_adb_command(
-            ["shell", "dumpsys", "activity", "activities"],
-            device_id=self.verifier.result.device_id,
-            timeout=30
-        )
+        success, stdout, stderr = self.probe_results["dumpsys"]
         
         # Dumpsys should work even without root
         self.assertTrue(success)
@@ -536,8 +847,10 @@ def save_report(result: ADBTestResult, output_path: Optional[Path] = None) -> st
     
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(output_path, 'w') as f:
-        f.write(result.to_json())
+    if ORJSON_AVAILABLE:
+        output_path.write_bytes(orjson.dumps(result.to_dict(), option=orjson.OPT_INDENT_2))
+    else:
+        output_path.write_text(result.to_json())
     
     return str(output_path)
 
@@ -565,7 +878,8 @@ if __name__ == "__main__":
         print(f"Manufacturer:      {result.device_info.get('manufacturer', 'N/A')}")
         print(f"Model:             {result.device_info.get('model', 'N/A')}")
         print(f"Android Version:   {result.device_info.get('android_version', 'N/A')}")
-        print(f"Rooted:            {'Yes' if result.device_info.get('rooted') else 'No'}")
+        rooted = result.device_info.get("rooted")
+        print(f"Rooted:            {'Unknown' if rooted is None else 'Yes' if rooted else 'No'}")
     
     print(f"\nTests Passed:      {len(result.tests_passed)}")
     print(f"Tests Failed:      {len(result.tests_failed)}")
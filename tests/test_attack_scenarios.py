@@ -8,8 +8,10 @@ that investigators might encounter in the field.
 Run with: python -m pytest tests/test_attack_scenarios.py -v
 """
 
-import base64
-import json
+import binascii
+import functools
+import hashlib
+import io
 import os
 import re
 import sqlite3
@@ -18,14 +20,68 @@ import sys
 import tempfile
 import time
 import unittest
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime
+from itertools import pairwise
 from pathlib import Path
 from typing import Dict, List, Optional
 from unittest.mock import MagicMock, patch, call
 
+# SIMD-accelerated base64 with the same API as the stdlib module, if installed
+try:
+    import pybase64 as b64codec
+except ImportError:
+    import base64 as b64codec
+
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# Prefixes of genuine vendor packages that malware likes to impersonate
+KNOWN_SYSTEM_PREFIXES = ("com.google.", "com.android.", "com.samsung.")
+
+# Keywords that mark a package name as suspicious, matched in one regex pass
+# over the lowercased name (faster than an IGNORECASE alternation)
+SUSPICIOUS_PKG_KEYWORDS = ('hidden', 'security', 'update', 'system')
+_SUSPICIOUS_PKG_RE = re.compile("|".join(map(re.escape, SUSPICIOUS_PKG_KEYWORDS)))
+
+# Command & Control domain indicators: risky TLDs or telltale words
+_C2_DOMAIN_RE = re.compile(r"\.(?:xyz|ru|cc)$|c2|malware|evil", re.IGNORECASE)
+
+# Screenshot stored in app-private data or under a hidden path component
+_SCREENSHOT_SUSPICIOUS_RE = re.compile(r"/data/data/|/\.[^/]")
+
+# Binaries and packages whose presence points at a rooted device
+ROOTKIT_FILES = (
+    "/system/xbin/su",
+    "/system/bin/su",
+    "/sbin/su",
+    "/system/app/Superuser.apk",
+    "/data/local/xbin/su",
+    "/system/xbin/busybox",
+)
+_ROOTKIT_BASENAMES = tuple(f.rsplit("/", 1)[-1] for f in ROOTKIT_FILES)
+
+# Stand-in for a SQLCipher database: zeroed header where the SQLite magic
+# would be, followed by 1000 bytes of non-SQLite page data
+_FAKE_ENCRYPTED_DB = b"\x00" * 16 + (bytes(range(256)) * 4)[:1000]
+
+
+@functools.lru_cache(maxsize=4096)
+def is_suspicious_package(pkg: str) -> bool:
+    """Package impersonates a system vendor or carries a suspicious keyword."""
+    return pkg.startswith(KNOWN_SYSTEM_PREFIXES) or _SUSPICIOUS_PKG_RE.search(pkg.lower()) is not None
+
+
+@functools.lru_cache(maxsize=4096)
+def is_c2_domain(domain: str) -> bool:
+    """Domain matches a Command & Control indicator."""
+    return _C2_DOMAIN_RE.search(domain) is not None
+
+
+def sha256_stream(fp) -> str:
+    """SHA-256 of a binary file object, hashed in chunks rather than read whole."""
+    return hashlib.file_digest(fp, "sha256").hexdigest()
+
 
 class TestAntiForensicsTechniques(unittest.TestCase):
     """Test handling of anti-forensics techniques."""
@@ -41,8 +97,8 @@ class TestAntiForensicsTechniques(unittest.TestCase):
             future_time = time.time() + 365 * 24 * 60 * 60  # 1 year in future
             os.utime(temp_file, (future_time, future_time))
             
-            # Detect anomaly
-            mtime = os.path.getmtime(temp_file)
+            # Detect anomaly from a single stat of the file
+            mtime = os.stat(temp_file).st_mtime
             is_future = mtime > time.time()
             
             self.assertTrue(is_future)
@@ -65,11 +121,9 @@ class TestAntiForensicsTechniques(unittest.TestCase):
     
     def test_deleted_file_markers(self):
         """Detect markers of deleted files in database."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-        
+        # In-memory database: no temp file, journal or fsync to pay for
+        conn = sqlite3.connect(":memory:")
         try:
-            conn = sqlite3.connect(db_path)
             conn.execute("""
                 CREATE TABLE files (
                     id INTEGER PRIMARY KEY,
@@ -78,70 +132,62 @@ class TestAntiForensicsTechniques(unittest.TestCase):
                     delete_time INTEGER
                 )
             """)
+            # Partial index: holds only the tombstoned rows
+            conn.execute("CREATE INDEX idx_files_deleted ON files(deleted) WHERE deleted = 1")
             
             # Insert records including "deleted" ones
-            conn.execute("INSERT INTO files VALUES (1, '/sdcard/photo.jpg', 0, NULL)")
-            conn.execute("INSERT INTO files VALUES (2, '/sdcard/secret.pdf', 1, 1703260800000)")
-            conn.execute("INSERT INTO files VALUES (3, '/sdcard/docs/file.txt', 1, 1703261800000)")
-            conn.commit()
+            files = [
+                (1, "/sdcard/photo.jpg", 0, None),
+                (2, "/sdcard/secret.pdf", 1, 1703260800000),
+                (3, "/sdcard/docs/file.txt", 1, 1703261800000),
+            ]
+            with conn:
+                conn.executemany("INSERT INTO files VALUES (?,?,?,?)", files)
             
             # Find deleted files
-            cursor = conn.execute("SELECT * FROM files WHERE deleted = 1")
-            deleted = cursor.fetchall()
-            conn.close()
-            
-            self.assertEqual(len(deleted), 2)
+            query = "SELECT * FROM files WHERE deleted = 1"
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+            deleted = conn.execute(query).fetchall()
         finally:
-            os.unlink(db_path)
+            conn.close()
+        
+        self.assertEqual(len(deleted), 2)
+        self.assertIn("USING INDEX idx_files_deleted", plan[0][-1])
     
     def test_obfuscated_data_detection(self):
         """Detect base64 encoded or obfuscated data."""
-        samples = [
-            "SGVsbG8gV29ybGQ=",  # Base64: "Hello World"
-            "VGhpcyBpcyBzZWNyZXQ=",  # Base64: "This is secret"
-            "aHR0cHM6Ly9leGFtcGxlLmNvbQ==",  # Base64: URL
-        ]
+        # bytes input skips a str -> ASCII conversion inside the decoder
+        samples = (
+            b"SGVsbG8gV29ybGQ=",  # Base64: "Hello World"
+            b"VGhpcyBpcyBzZWNyZXQ=",  # Base64: "This is secret"
+            b"aHR0cHM6Ly9leGFtcGxlLmNvbQ==",  # Base64: URL
+        )
         
         for sample in samples:
             try:
-                decoded = base64.b64decode(sample)
+                b64codec.b64decode(sample, validate=True)
                 is_valid_base64 = True
-                self.assertIsNotNone(decoded)
-            except Exception:
+            except binascii.Error:
                 is_valid_base64 = False
+            self.assertTrue(is_valid_base64, sample)
     
     def test_encrypted_database_detection(self):
         """Detect encrypted SQLite databases."""
-        # Create fake encrypted database (SQLCipher pattern)
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            # SQLCipher encrypted DBs have specific header
-            f.write(b'\x00' * 16)  # Encrypted header
-            f.write(os.urandom(1000))
-            encrypted_db = f.name
-        
+        # Create fake encrypted database (SQLCipher pattern); the file is
+        # removed when the context exits, after sqlite has closed it
         is_encrypted = False
-        conn = None
-        try:
-            # Try to open - should fail when querying
-            conn = sqlite3.connect(encrypted_db)
-            conn.execute("SELECT * FROM sqlite_master")
-            is_encrypted = False
-        except sqlite3.DatabaseError:
-            is_encrypted = True
-        finally:
-            if conn:
-                try:
-                    conn.close()
-                except Exception:
-                    pass
-            # Small delay to ensure file handle is released on Windows
-            import gc
-            gc.collect()
-            time.sleep(0.1)
+        with tempfile.NamedTemporaryFile(suffix='.db', delete_on_close=False) as f:
+            f.write(_FAKE_ENCRYPTED_DB)
+            f.close()
+            
+            conn = sqlite3.connect(f.name)
             try:
-                os.unlink(encrypted_db)
-            except PermissionError:
-                pass  # May fail on Windows, ignore
+                # Try to open - should fail when querying
+                conn.execute("SELECT * FROM sqlite_master")
+            except sqlite3.DatabaseError:
+                is_encrypted = True
+            finally:
+                conn.close()
         
         self.assertTrue(is_encrypted)
 
@@ -159,23 +205,8 @@ class TestMalwareArtifacts(unittest.TestCase):
             "com.system.service.hidden",
         ]
         
-        known_legit_prefixes = [
-            "com.google.",
-            "com.android.",
-            "com.samsung.",
-        ]
-        
-        suspicious_keywords = ['hidden', 'security', 'update', 'system']
-        
-        # Check if packages look like they're impersonating system apps
-        detected_suspicious = []
-        for pkg in suspicious_packages:
-            looks_like_system = any(pkg.startswith(p) for p in known_legit_prefixes)
-            has_suspicious_words = any(w in pkg.lower() for w in suspicious_keywords)
-            
-            # Flag as suspicious if it looks like system app AND has suspicious keywords
-            if looks_like_system or has_suspicious_words:
-                detected_suspicious.append(pkg)
+        # Flag packages that look like system apps or carry suspicious keywords
+        detected_suspicious = [pkg for pkg in suspicious_packages if is_suspicious_package(pkg)]
         
         # All our test cases should be flagged as suspicious
         self.assertEqual(len(detected_suspicious), len(suspicious_packages))
@@ -201,15 +232,6 @@ class TestMalwareArtifacts(unittest.TestCase):
     
     def test_rootkit_indicators(self):
         """Detect potential rootkit indicators."""
-        suspicious_files = [
-            "/system/xbin/su",
-            "/system/bin/su",
-            "/sbin/su",
-            "/system/app/Superuser.apk",
-            "/data/local/xbin/su",
-            "/system/xbin/busybox",
-        ]
-        
         suspicious_props = [
             "ro.debuggable=1",
             "ro.secure=0",
@@ -217,9 +239,8 @@ class TestMalwareArtifacts(unittest.TestCase):
         ]
         
         # In real scenario, check if these exist
-        for file in suspicious_files:
-            path = Path(file)
-            self.assertTrue(path.name in ["su", "busybox", "Superuser.apk"])
+        for name in _ROOTKIT_BASENAMES:
+            self.assertIn(name, {"su", "busybox", "Superuser.apk"})
         
         for prop in suspicious_props:
             key, value = prop.split("=")
@@ -234,16 +255,8 @@ class TestMalwareArtifacts(unittest.TestCase):
             "download.suspicious-cdn.cc",
         ]
         
-        suspicious_patterns = [
-            r"\.xyz$",
-            r"\.ru$",
-            r"\.cc$",
-            r"c2|malware|evil",
-        ]
-        
         for domain in suspicious_domains:
-            is_suspicious = any(re.search(p, domain, re.I) for p in suspicious_patterns)
-            self.assertTrue(is_suspicious)
+            self.assertTrue(is_c2_domain(domain))
 
 
 class TestDataExfiltrationScenarios(unittest.TestCase):
@@ -251,42 +264,30 @@ class TestDataExfiltrationScenarios(unittest.TestCase):
     
     def test_large_data_transfer_detection(self):
         """Detect unusually large data transfers."""
-        network_log = [
-            {"app": "com.whatsapp", "bytes_sent": 1024000, "bytes_recv": 2048000},
-            {"app": "com.unknown.app", "bytes_sent": 500000000, "bytes_recv": 100},  # Suspicious
-            {"app": "com.android.chrome", "bytes_sent": 5000000, "bytes_recv": 50000000},
-            {"app": "com.malicious.app", "bytes_sent": 1000000000, "bytes_recv": 50},  # Suspicious
+        # Per-app traffic as parallel columns
+        apps = ("com.whatsapp", "com.unknown.app", "com.android.chrome", "com.malicious.app")
+        bytes_sent = (1024000, 500000000, 5000000, 1000000000)
+        bytes_recv = (2048000, 100, 50000000, 50)
+        
+        # Detect asymmetric traffic (lots of upload, little download):
+        # sent > 1000 * recv, compared in integers with no per-row division
+        suspicious = [
+            app for app, sent, recv in zip(apps, bytes_sent, bytes_recv)
+            if sent > 1000 * max(recv, 1)
         ]
         
-        # Detect asymmetric traffic (lots of upload, little download)
-        suspicious = []
-        for entry in network_log:
-            ratio = entry["bytes_sent"] / max(entry["bytes_recv"], 1)
-            if ratio > 1000:  # Sent 1000x more than received
-                suspicious.append(entry)
-        
-        self.assertEqual(len(suspicious), 2)
+        self.assertEqual(suspicious, ["com.unknown.app", "com.malicious.app"])
     
     def test_contact_harvesting_detection(self):
         """Detect mass contact access patterns."""
-        access_log = []
-        
-        # Simulate contact access log
-        for i in range(1000):
-            access_log.append({
-                "timestamp": datetime.now() - timedelta(minutes=i % 60),
-                "action": "read_contact",
-                "app": "com.suspicious.app" if i < 900 else "com.whatsapp"
-            })
+        # Simulate the app column of a contact access log
+        apps = ("com.suspicious.app" if i < 900 else "com.whatsapp" for i in range(1000))
         
         # Analyze access patterns
-        app_access = {}
-        for entry in access_log:
-            app = entry["app"]
-            app_access[app] = app_access.get(app, 0) + 1
+        app_access = Counter(apps)
         
         # Detect bulk access
-        suspicious_apps = [app for app, count in app_access.items() if count > 100]
+        suspicious_apps = [app for app, count in app_access.most_common() if count > 100]
         self.assertIn("com.suspicious.app", suspicious_apps)
     
     def test_screenshot_detection(self):
@@ -301,7 +302,7 @@ class TestDataExfiltrationScenarios(unittest.TestCase):
         suspicious = []
         for path in screenshot_paths:
             # Check for hidden directories or app data
-            if "/data/data/" in path or "/." in path:
+            if _SCREENSHOT_SUSPICIOUS_RE.search(path):
                 suspicious.append(path)
         
         self.assertEqual(len(suspicious), 2)
@@ -311,30 +312,34 @@ class TestDeviceTamperingScenarios(unittest.TestCase):
     """Test scenarios related to device tampering."""
     
     @patch('subprocess.run')
-    def test_bootloader_unlock_detection(self, mock_run):
-        """Detect unlocked bootloader."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="Device unlocked: true"
-        )
-        
-        result = mock_run.return_value.stdout
-        is_unlocked = "unlocked: true" in result.lower()
-        self.assertTrue(is_unlocked)
-    
-    @patch('subprocess.run')
-    def test_custom_rom_detection(self, mock_run):
-        """Detect custom ROM installation."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="""ro.build.display.id=LineageOS 20.0-20240115
-ro.lineage.version=20.0-20240115-NIGHTLY"""
-        )
-        
-        result = mock_run.return_value.stdout
+    def test_tampering_indicators(self, mock_run):
+        """Detect unlocked bootloader, custom ROM and ADB over network."""
         custom_rom_indicators = ["lineage", "cyanogen", "resurrection", "pixel experience"]
-        has_custom = any(ind in result.lower() for ind in custom_rom_indicators)
-        self.assertTrue(has_custom)
+        cases = [
+            (
+                "bootloader_unlock",
+                "Device unlocked: true",
+                lambda out: "unlocked: true" in out.lower(),
+            ),
+            (
+                "custom_rom",
+                """ro.build.display.id=LineageOS 20.0-20240115
+ro.lineage.version=20.0-20240115-NIGHTLY""",
+                lambda out: any(ind in out.lower() for ind in custom_rom_indicators),
+            ),
+            (
+                "adb_over_network",
+                "service.adb.tcp.port=5555",
+                lambda out: "adb.tcp.port" in out and "5555" in out,
+            ),
+        ]
+        
+        # One patch context shared by every indicator
+        for name, stdout, detected in cases:
+            with self.subTest(name=name):
+                mock_run.return_value = MagicMock(returncode=0, stdout=stdout)
+                result = mock_run.return_value.stdout
+                self.assertTrue(detected(result))
     
     @patch('subprocess.run')
     def test_magisk_detection(self, mock_run):
@@ -362,18 +367,6 @@ ro.lineage.version=20.0-20240115-NIGHTLY"""
                 found.append(indicator)
         
         self.assertGreater(len(found), 0)
-    
-    @patch('subprocess.run')
-    def test_adb_over_network_detection(self, mock_run):
-        """Detect ADB enabled over network."""
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="service.adb.tcp.port=5555"
-        )
-        
-        result = mock_run.return_value.stdout
-        adb_network = "adb.tcp.port" in result and "5555" in result
-        self.assertTrue(adb_network)
 
 
 class TestCommunicationAnalysis(unittest.TestCase):
@@ -381,11 +374,8 @@ class TestCommunicationAnalysis(unittest.TestCase):
     
     def test_deleted_message_recovery(self):
         """Test recovery of deleted messages from database."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-        
+        conn = sqlite3.connect(":memory:")
         try:
-            conn = sqlite3.connect(db_path)
             conn.execute("""
                 CREATE TABLE messages (
                     _id INTEGER PRIMARY KEY,
@@ -395,6 +385,9 @@ class TestCommunicationAnalysis(unittest.TestCase):
                     deleted INTEGER DEFAULT 0
                 )
             """)
+            conn.execute(
+                "CREATE INDEX idx_messages_deleted ON messages(deleted) WHERE deleted = 1"
+            )
             
             # Insert messages including soft-deleted
             messages = [
@@ -404,19 +397,19 @@ class TestCommunicationAnalysis(unittest.TestCase):
                 (4, "+1111111111", "Deleted: Password is 1234", 1703263000000, 1),
             ]
             
-            for msg in messages:
-                conn.execute("INSERT INTO messages VALUES (?,?,?,?,?)", msg)
-            conn.commit()
+            with conn:
+                conn.executemany("INSERT INTO messages VALUES (?,?,?,?,?)", messages)
             
             # Recover deleted
-            cursor = conn.execute("SELECT * FROM messages WHERE deleted = 1")
-            deleted = cursor.fetchall()
-            conn.close()
-            
-            self.assertEqual(len(deleted), 2)
-            self.assertIn("Password", deleted[1][2])
+            query = "SELECT * FROM messages WHERE deleted = 1"
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+            deleted = conn.execute(query).fetchall()
         finally:
-            os.unlink(db_path)
+            conn.close()
+        
+        self.assertEqual(len(deleted), 2)
+        self.assertIn("USING INDEX idx_messages_deleted", plan[0][-1])
+        self.assertIn("Password", deleted[1][2])
     
     def test_encrypted_messaging_detection(self):
         """Detect usage of encrypted messaging apps."""
@@ -455,12 +448,12 @@ class TestCommunicationAnalysis(unittest.TestCase):
             "01-15 14:40:00 I/Zoom: Meeting started",
         ]
         
-        voip_detected = []
-        for entry in log_entries:
-            for app in voip_apps:
-                app_name = app.split('.')[-1]
-                if app_name.lower() in entry.lower():
-                    voip_detected.append(entry)
+        # One case-insensitive alternation over the app names scans each entry once
+        voip_re = re.compile(
+            "|".join(re.escape(app.rsplit('.', 1)[-1]) for app in voip_apps),
+            re.IGNORECASE,
+        )
+        voip_detected = [entry for entry in log_entries if voip_re.search(entry)]
         
         self.assertGreater(len(voip_detected), 0)
 
@@ -470,36 +463,42 @@ class TestTimelineReconstruction(unittest.TestCase):
     
     def test_cross_artifact_timeline(self):
         """Build timeline from multiple artifact sources."""
-        events = []
-        
         # SMS events
         sms = [
             {"time": "2024-01-15 14:00:00", "type": "sms", "detail": "Received from +123"},
             {"time": "2024-01-15 14:05:00", "type": "sms", "detail": "Sent to +456"},
         ]
-        events.extend(sms)
         
         # Call events
         calls = [
             {"time": "2024-01-15 14:02:00", "type": "call", "detail": "Incoming from +789"},
             {"time": "2024-01-15 14:10:00", "type": "call", "detail": "Outgoing to +123"},
         ]
-        events.extend(calls)
         
         # Location events
         locations = [
             {"time": "2024-01-15 14:01:00", "type": "location", "detail": "GPS: 40.7128, -74.0060"},
             {"time": "2024-01-15 14:08:00", "type": "location", "detail": "GPS: 40.7580, -73.9855"},
         ]
-        events.extend(locations)
         
-        # Sort by time
-        timeline = sorted(events, key=lambda x: x["time"])
+        # Struct-of-arrays: parallel columns, with the time parsed once
+        # into an integer epoch key instead of compared as strings
+        times, types, details = [], [], []
+        for source in (sms, calls, locations):
+            for event in source:
+                times.append(int(datetime.fromisoformat(event["time"]).timestamp()))
+                types.append(event["type"])
+                details.append(event["detail"])
+        
+        # Sort by time; the key is a C-level getter, not a Python lambda
+        order = sorted(range(len(times)), key=times.__getitem__)
+        timeline = [types[i] for i in order]
         
         self.assertEqual(len(timeline), 6)
-        self.assertEqual(timeline[0]["type"], "sms")  # 14:00:00
-        self.assertEqual(timeline[1]["type"], "location")  # 14:01:00
-        self.assertEqual(timeline[-1]["type"], "call")  # 14:10:00
+        self.assertEqual(timeline[0], "sms")  # 14:00:00
+        self.assertEqual(timeline[1], "location")  # 14:01:00
+        self.assertEqual(timeline[-1], "call")  # 14:10:00
+        self.assertEqual(details[order[0]], "Received from +123")
     
     def test_gap_detection_in_timeline(self):
         """Detect suspicious gaps in activity."""
@@ -511,18 +510,19 @@ class TestTimelineReconstruction(unittest.TestCase):
             {"time": "2024-01-15 18:05:00"},
         ]
         
-        gaps = []
-        for i in range(1, len(events)):
-            t1 = datetime.fromisoformat(events[i-1]["time"])
-            t2 = datetime.fromisoformat(events[i]["time"])
-            gap = (t2 - t1).total_seconds() / 60  # In minutes
-            
-            if gap > 60:  # Gap larger than 1 hour
-                gaps.append({
-                    "start": events[i-1]["time"],
-                    "end": events[i]["time"],
-                    "duration_minutes": gap
-                })
+        # Parse each timestamp once, then difference neighbours in minutes
+        minutes = [datetime.fromisoformat(e["time"]).timestamp() // 60 for e in events]
+        deltas = [t2 - t1 for t1, t2 in pairwise(minutes)]
+        
+        # Only gaps larger than 1 hour become records
+        gaps = [
+            {
+                "start": events[i]["time"],
+                "end": events[i + 1]["time"],
+                "duration_minutes": delta
+            }
+            for i, delta in enumerate(deltas) if delta > 60
+        ]
         
         self.assertEqual(len(gaps), 1)
         self.assertEqual(gaps[0]["duration_minutes"], 230)  # 3 hours 50 minutes
@@ -530,30 +530,28 @@ class TestTimelineReconstruction(unittest.TestCase):
     def test_activity_pattern_anomaly(self):
         """Detect anomalous activity patterns."""
         # Typical user is active 8am-11pm
-        activities = []
+        times = []
+        counts = []
         
         # Normal activity
         for hour in range(8, 23):
-            activities.append({
-                "time": f"2024-01-15 {hour:02d}:00:00",
-                "count": 10 + (hour % 5)
-            })
+            times.append(f"2024-01-15 {hour:02d}:00:00")
+            counts.append(10 + (hour % 5))
         
         # Anomalous 3am activity
-        activities.append({
-            "time": "2024-01-16 03:00:00",
-            "count": 50  # High activity at unusual hour
-        })
+        times.append("2024-01-16 03:00:00")
+        counts.append(50)  # High activity at unusual hour
+        
+        # Hour column parsed once, by fixed offset, outside the scan
+        hours = [int(t[11:13]) for t in times]
         
-        # Detect anomalies
-        anomalies = []
-        for activity in activities:
-            hour = int(activity["time"].split()[1].split(":")[0])
-            if hour < 6 or hour > 23:  # Outside normal hours
-                if activity["count"] > 5:  # Significant activity
-                    anomalies.append(activity)
+        # Detect anomalies: outside normal hours with significant activity
+        anomalies = [
+            times[i] for i, (hour, count) in enumerate(zip(hours, counts))
+            if (hour < 6 or hour > 23) and count > 5
+        ]
         
-        self.assertEqual(len(anomalies), 1)
+        self.assertEqual(anomalies, ["2024-01-16 03:00:00"])
 
 
 class TestChainOfCustody(unittest.TestCase):
@@ -561,13 +559,11 @@ class TestChainOfCustody(unittest.TestCase):
     
     def test_evidence_hash_chain(self):
         """Verify hash chain for evidence integrity."""
-        import hashlib
-        
         evidence_chain = []
         
         # Original evidence
-        original_data = b"Original forensic evidence data"
-        original_hash = hashlib.sha256(original_data).hexdigest()
+        original_data = io.BytesIO(b"Original forensic evidence data")
+        original_hash = sha256_stream(original_data)
         evidence_chain.append({
             "stage": "acquisition",
             "hash": original_hash,
@@ -575,8 +571,8 @@ class TestChainOfCustody(unittest.TestCase):
         })
         
         # After processing (should be same hash if unmodified)
-        processed_data = b"Original forensic evidence data"
-        processed_hash = hashlib.sha256(processed_data).hexdigest()
+        processed_data = io.BytesIO(b"Original forensic evidence data")
+        processed_hash = sha256_stream(processed_data)
         evidence_chain.append({
             "stage": "analysis",
             "hash": processed_hash,
@@ -592,10 +588,19 @@ class TestChainOfCustody(unittest.TestCase):
     
     def test_audit_log_integrity(self):
         """Test audit log cannot be tampered."""
-        import hashlib
-        
         audit_log = []
         
+        def entry_digest(prev_hash: str, *fields: str) -> str:
+            # Raw previous digest followed by length-prefixed fields: an
+            # unambiguous preimage fed to the hash piece by piece, with no
+            # size limit and no serialized copy of the entry
+            h = hashlib.sha256(bytes.fromhex(prev_hash))
+            for field in fields:
+                data = field.encode()
+                h.update(len(data).to_bytes(4, "big"))
+                h.update(data)
+            return h.hexdigest()
+        
         def add_entry(action: str, details: str):
             entry = {
                 "timestamp": datetime.now().isoformat(),
@@ -605,8 +610,9 @@ class TestChainOfCustody(unittest.TestCase):
             
             # Calculate hash including previous entry hash
             prev_hash = audit_log[-1]["entry_hash"] if audit_log else "0" * 64
-            entry_str = json.dumps(entry) + prev_hash
-            entry["entry_hash"] = hashlib.sha256(entry_str.encode()).hexdigest()
+            entry["entry_hash"] = entry_digest(
+                prev_hash, entry["timestamp"], action, details
+            )
             entry["prev_hash"] = prev_hash
             
             audit_log.append(entry)
@@ -615,6 +621,7 @@ class TestChainOfCustody(unittest.TestCase):
         add_entry("device_connected", "OnePlus LE2117")
         add_entry("data_extracted", "contacts.db")
         add_entry("data_extracted", "messages.db")
+        add_entry("note_added", "x" * 4096)  # Entries of any length hash and chain correctly
         
         # Verify chain
         for i in range(1, len(audit_log)):
@@ -622,6 +629,11 @@ class TestChainOfCustody(unittest.TestCase):
                 audit_log[i]["prev_hash"],
                 audit_log[i-1]["entry_hash"]
             )
+        for entry in audit_log:
+            self.assertEqual(
+                entry["entry_hash"],
+                entry_digest(entry["prev_hash"], entry["timestamp"], entry["action"], entry["details"])
+            )
     
     def test_officer_action_logging(self):
         """Test logging of officer actions."""
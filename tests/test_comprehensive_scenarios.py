@@ -12,25 +12,152 @@ Run with: python -m pytest tests/test_comprehensive_scenarios.py -v
 """
 
 import asyncio
+import functools
 import json
 import os
+import re
 import sqlite3
 import subprocess
 import sys
 import tempfile
-import threading
 import time
 import unittest
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import compress
 from pathlib import Path
+from queue import Queue
 from typing import Optional
 from unittest.mock import MagicMock, patch, PropertyMock
 
+# Faster JSON encoder, if installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+# One `[key]: [value]` line of a full `adb shell getprop` dump
+_GETPROP_LINE_RE = re.compile(r"^\[([^\]]+)\]: \[([^\]]*)\]$", re.MULTILINE)
+
+# One threadtime logcat line; anchored with no nested repetition, so each
+# line is matched in a single forward pass
+_LOGCAT_LINE_RE = re.compile(
+    r"^(?P<date>\d\d-\d\d) (?P<time>\S+) +(?P<pid>\d+) +\d+ "
+    r"(?P<level>[VDIWEF]) (?P<tag>[^:]+): (?P<message>.*)$",
+    re.MULTILINE,
+)
+
+# Messaging app keywords, matched against package names in one regex pass
+MESSAGING_KEYWORDS = ("whatsapp", "telegram", "orca")
+_MESSAGING_PKG_RE = re.compile("|".join(map(re.escape, MESSAGING_KEYWORDS)))
+
+
+def dumps_compact(obj) -> bytes:
+    """Serialize to compact JSON bytes, with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def parse_getprop_dump(output: str) -> dict:
+    """Parse the full `adb shell getprop` dump into a dict in one pass."""
+    return dict(_GETPROP_LINE_RE.findall(output))
+
+
+def bulk_getprop(props, serial: Optional[str] = None) -> dict:
+    """Fetch several properties with one chained `adb shell getprop` call.
+    
+    Each value is echoed in the `[key]: [value]` dump format, so results are
+    matched by name rather than by line order. Raises CalledProcessError if
+    adb fails and LookupError if a requested property is missing.
+    """
+    cmd = ["adb"] + (["-s", serial] if serial else [])
+    cmd += ["shell", " ; ".join(f'echo "[{prop}]: [$(getprop {prop})]"' for prop in props)]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, cmd, result.stdout, result.stderr)
+    
+    values = parse_getprop_dump(result.stdout)
+    missing = [prop for prop in props if prop not in values]
+    if missing:
+        raise LookupError(f"getprop returned no line for {', '.join(missing)}")
+    return {prop: values[prop] for prop in props}
+
+
+# Bumped per serial to drop that device's cached ro.* values
+_ro_prop_generation: dict = {}
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_ro_prop(serial: Optional[str], prop: str, generation: int) -> str:
+    return bulk_getprop([prop], serial)[prop]
+
+
+def get_ro_prop(serial: Optional[str], prop: str) -> str:
+    """Read a device property, caching build-time `ro.*` values per device.
+    
+    Mutable properties (`persist.*`, `sys.*`, ...) are always read live.
+    A failed read raises instead of returning a value, so it is never cached.
+    """
+    if not prop.startswith("ro."):
+        return bulk_getprop([prop], serial)[prop]
+    return _cached_ro_prop(serial, prop, _ro_prop_generation.get(serial, 0))
+
+
+def invalidate_ro_props(serial: Optional[str]) -> None:
+    """Forget cached `ro.*` values for a device, e.g. after it reconnects."""
+    _ro_prop_generation[serial] = _ro_prop_generation.get(serial, 0) + 1
+
+
+def iter_files(root, suffix: str):
+    """Yield paths of files under root ending in suffix.
+    
+    Walks with os.scandir and an explicit stack; DirEntry type checks use
+    the d_type cached from the directory read, so no per-entry stat.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(suffix):
+                    yield entry.path
+
+
+class SQLiteReaderPool:
+    """Pre-opened read-only connections shared by reader threads.
+    
+    The database should be in WAL mode so readers run alongside each
+    other and the single writer instead of serializing on the file lock.
+    """
+    
+    def __init__(self, db_path: str, size: int = 4):
+        self._size = size
+        self._idle = Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+            self._idle.put(conn)
+    
+    @contextmanager
+    def acquire(self):
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+    
+    def close(self):
+        for _ in range(self._size):
+            self._idle.get().close()
+
 
 # =============================================================================
 # EASY TESTS - Basic Functionality
@@ -133,6 +260,15 @@ class TestEasyModuleImports(unittest.TestCase):
 # MEDIUM TESTS - Integration Scenarios
 # =============================================================================
 
+def fake_getprop(values: dict):
+    """subprocess.run stand-in answering bulk_getprop commands from values."""
+    def run(cmd, **kwargs):
+        names = re.findall(r"getprop (\S+?)\)", cmd[-1])
+        stdout = "".join(f"[{name}]: [{value}]\n" for name, value in values.items() if name in names)
+        return MagicMock(returncode=0, stdout=stdout, stderr="")
+    return run
+
+
 class TestMediumDeviceOperations(unittest.TestCase):
     """Medium complexity tests for device operations."""
     
@@ -164,19 +300,48 @@ RF8M33DEVICE3\tdevice model:OnePlus_9"""
             "ro.serialno": "RF8M33ABCDEF"
         }
         
-        def mock_getprop(cmd, **kwargs):
-            prop = cmd[-1] if cmd[-1].startswith("ro.") else None
-            return MagicMock(
-                returncode=0,
-                stdout=properties.get(prop, "unknown")
-            )
+        # Device answers in the order it likes; values are matched by name
+        mock_run.side_effect = fake_getprop(dict(reversed(properties.items())))
+        
+        # All properties come back from a single adb round-trip
+        self.assertEqual(bulk_getprop(list(properties)), properties)
+        self.assertEqual(mock_run.call_count, 1)
         
-        mock_run.side_effect = mock_getprop
+        # A short answer is an error, not an empty value
+        with self.assertRaises(LookupError):
+            bulk_getprop(["ro.product.model", "ro.not.answered"])
         
-        # Simulate property retrieval
-        for prop, expected in properties.items():
-            result = mock_run(["adb", "shell", "getprop", prop])
-            self.assertEqual(result.stdout, expected)
+        # Full dump fallback parses in one pass
+        dump = "".join(f"[{prop}]: [{value}]\n" for prop, value in properties.items())
+        self.assertEqual(parse_getprop_dump(dump), properties)
+    
+    @patch('subprocess.run')
+    def test_ro_property_cache(self, mock_run):
+        """Test build-time properties are fetched once per device."""
+        values = {"ro.product.model": "SM-G950F", "persist.sys.timezone": "UTC"}
+        serial = "RF8M33CACHE"
+        invalidate_ro_props(serial)
+        
+        # A failed adb call raises and leaves nothing cached
+        mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="error: device offline")
+        with self.assertRaises(subprocess.CalledProcessError):
+            get_ro_prop(serial, "ro.product.model")
+        mock_run.reset_mock(return_value=True)
+        
+        mock_run.side_effect = fake_getprop(values)
+        self.assertEqual(get_ro_prop(serial, "ro.product.model"), "SM-G950F")
+        self.assertEqual(get_ro_prop(serial, "ro.product.model"), "SM-G950F")
+        self.assertEqual(mock_run.call_count, 1)
+        
+        # Mutable properties bypass the cache
+        get_ro_prop(serial, "persist.sys.timezone")
+        get_ro_prop(serial, "persist.sys.timezone")
+        self.assertEqual(mock_run.call_count, 3)
+        
+        # Reconnecting the device forces a fresh read
+        invalidate_ro_props(serial)
+        get_ro_prop(serial, "ro.product.model")
+        self.assertEqual(mock_run.call_count, 4)
     
     @patch('subprocess.run')
     def test_package_list_filtering(self, mock_run):
@@ -196,19 +361,15 @@ package:com.instagram.android"""
         ]
         
         # Filter for messaging apps (whatsapp, telegram.messenger, facebook.orca)
-        messaging = [p for p in packages if any(
-            x in p for x in ["whatsapp", "telegram", "orca"]
-        )]
+        messaging = [p for p in packages if _MESSAGING_PKG_RE.search(p)]
         
         self.assertEqual(len(messaging), 3)
     
     def test_sqlite_database_operations(self):
         """Test SQLite database creation and querying."""
-        with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as f:
-            db_path = f.name
-        
+        # Durability is irrelevant here, so skip the file and its journal fsyncs
+        conn = sqlite3.connect(":memory:")
         try:
-            conn = sqlite3.connect(db_path)
             cursor = conn.cursor()
             
             # Create tables similar to Android databases
@@ -234,11 +395,10 @@ package:com.instagram.android"""
             # Query by address
             cursor.execute("SELECT * FROM messages WHERE address = ?", ("+1234567890",))
             results = cursor.fetchall()
-            conn.close()
             
             self.assertEqual(len(results), 2)
         finally:
-            os.unlink(db_path)
+            conn.close()
 
 
 class TestMediumDataProcessing(unittest.TestCase):
@@ -251,24 +411,14 @@ class TestMediumDataProcessing(unittest.TestCase):
 01-15 14:30:45.345  1234  1234 W System: Warning message
 01-15 14:30:45.456  1234  1234 E Error: Something went wrong"""
         
-        lines = logcat_sample.strip().split("\n")
-        parsed = []
-        
-        for line in lines:
-            parts = line.split()
-            if len(parts) >= 6:
-                parsed.append({
-                    "date": parts[0],
-                    "time": parts[1],
-                    "pid": parts[2],
-                    "level": parts[4],
-                    "tag": parts[5].rstrip(":"),
-                    "message": " ".join(parts[6:])
-                })
+        # Single regex pass over the whole buffer, no per-line splitting
+        parsed = [m.groupdict() for m in _LOGCAT_LINE_RE.finditer(logcat_sample)]
         
         self.assertEqual(len(parsed), 4)
         self.assertEqual(parsed[2]["level"], "W")
         self.assertEqual(parsed[3]["level"], "E")
+        self.assertEqual(parsed[0]["tag"], "ActivityManager")
+        self.assertEqual(parsed[3]["message"], "Something went wrong")
     
     def test_timeline_construction(self):
         """Test building investigation timeline."""
@@ -279,11 +429,15 @@ class TestMediumDataProcessing(unittest.TestCase):
             {"time": "2024-01-15 14:40:00", "type": "location", "action": "gps_update"},
         ]
         
-        # Sort by time
-        timeline = sorted(events, key=lambda x: x["time"])
+        # Parse each time once into an integer epoch leading a plain tuple,
+        # so the sort runs on the C tuple comparator with no key callback
+        timeline = sorted(
+            (int(datetime.fromisoformat(e["time"]).timestamp()), e["type"], e["action"])
+            for e in events
+        )
         
-        self.assertEqual(timeline[0]["type"], "app")
-        self.assertEqual(timeline[-1]["type"], "location")
+        self.assertEqual(timeline[0][1], "app")
+        self.assertEqual(timeline[-1][1], "location")
     
     def test_contact_deduplication(self):
         """Test deduplicating contact records."""
@@ -314,25 +468,54 @@ class TestHardConcurrentOperations(unittest.TestCase):
     
     def test_concurrent_file_processing(self):
         """Test processing multiple files concurrently."""
-        results = []
-        lock = threading.Lock()
-        
         def process_file(file_id):
-            time.sleep(0.1)  # Simulate processing
-            with lock:
-                results.append({
-                    "file_id": file_id,
-                    "processed": True,
-                    "timestamp": datetime.now().isoformat()
-                })
-            return file_id
-        
+            time.sleep(0.1)  # Simulate processing (I/O-bound, so threads fit)
+            return {
+                "file_id": file_id,
+                "processed": True,
+                "timestamp": datetime.now().isoformat()
+            }
+        
+        # Each worker returns its record; no shared list, so no lock
         with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(process_file, i) for i in range(10)]
-            completed = [f.result() for f in futures]
+            results = list(executor.map(process_file, range(10)))
+        completed = [r["file_id"] for r in results]
         
         self.assertEqual(len(results), 10)
-        self.assertEqual(len(completed), 10)
+        self.assertEqual(completed, list(range(10)))
+    
+    def test_concurrent_database_reads(self):
+        """Test many reader threads sharing a pool of WAL connections."""
+        addresses = ["+1234567890", "+0987654321", "+1122334455", "+5566778899"]
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "mmssms.db")
+            
+            # Single writer populates the evidence database
+            writer = sqlite3.connect(db_path)
+            writer.execute("PRAGMA journal_mode = WAL")
+            writer.execute("CREATE TABLE messages (_id INTEGER PRIMARY KEY, address TEXT)")
+            writer.executemany(
+                "INSERT INTO messages (address) VALUES (?)",
+                ((addresses[i % len(addresses)],) for i in range(1000)),
+            )
+            writer.commit()
+            
+            pool = SQLiteReaderPool(db_path, size=4)
+            try:
+                def count_messages(address):
+                    with pool.acquire() as conn:
+                        return conn.execute(
+                            "SELECT COUNT(*) FROM messages WHERE address = ?", (address,)
+                        ).fetchone()[0]
+                
+                with ThreadPoolExecutor(max_workers=8) as executor:
+                    counts = list(executor.map(count_messages, addresses * 5))
+            finally:
+                pool.close()
+                writer.close()
+        
+        self.assertEqual(counts, [250] * 20)
     
     def test_timeout_handling(self):
         """Test handling of operation timeouts."""
@@ -347,18 +530,22 @@ class TestHardConcurrentOperations(unittest.TestCase):
     
     def test_large_data_processing(self):
         """Test processing large datasets."""
-        # Simulate processing 10000 SMS records
-        records = [
-            {"id": i, "body": f"Message {i}" * 10, "timestamp": i * 1000}
-            for i in range(10000)
-        ]
+        # Simulate processing 10000 SMS records, stored as parallel columns
+        ids = range(10000)
+        bodies = [f"Message {i}" * 10 for i in ids]
+        timestamps = [i * 1000 for i in ids]
         
-        # Filter and transform
+        # Filter on the id column once, then apply the mask to every column
         start = time.time()
-        filtered = [r for r in records if r["id"] % 2 == 0]
+        keep = [not i & 1 for i in ids]
+        filtered_ids = list(compress(ids, keep))
+        filtered_bodies = list(compress(bodies, keep))
+        filtered_timestamps = list(compress(timestamps, keep))
         elapsed = time.time() - start
         
-        self.assertEqual(len(filtered), 5000)
+        self.assertEqual(len(filtered_ids), 5000)
+        self.assertEqual(len(filtered_bodies), 5000)
+        self.assertEqual(filtered_timestamps[1], 2000)
         self.assertLess(elapsed, 1.0)  # Should complete in under 1 second
     
     def test_recursive_directory_scanning(self):
@@ -374,7 +561,7 @@ class TestHardConcurrentOperations(unittest.TestCase):
                     (subsubdir / f"file_{j}.txt").write_text("data")
             
             # Count all files recursively
-            files = list(Path(tmpdir).rglob("*.txt"))
+            files = list(iter_files(tmpdir, ".txt"))
             self.assertEqual(len(files), 9)
 
 
@@ -539,11 +726,12 @@ class TestEdgeCaseInputValidation(unittest.TestCase):
     
     def test_extremely_long_strings(self):
         """Test handling very long strings."""
-        long_string = "A" * 1_000_000  # 1 million characters
+        # Evidence is kept as bytes, so hashing needs no 1 MB encode copy
+        long_data = b"A" * 1_000_000  # 1 million characters
         
         # Should be able to hash
         import hashlib
-        hash_value = hashlib.sha256(long_string.encode()).hexdigest()
+        hash_value = hashlib.sha256(long_data).hexdigest()
         self.assertEqual(len(hash_value), 64)
     
     def test_special_characters_in_paths(self):
@@ -688,19 +876,27 @@ class TestEdgeCaseDataFormats(unittest.TestCase):
             db_path = f.name
         
         try:
+            import hashlib
             conn = sqlite3.connect(db_path)
-            conn.execute("CREATE TABLE blobs (id INTEGER, data BLOB)")
+            # id aliases the rowid, which incremental blob I/O addresses by
+            conn.execute("CREATE TABLE blobs (id INTEGER PRIMARY KEY, data BLOB)")
             
             # Insert binary data
             binary_data = os.urandom(1024)
             conn.execute("INSERT INTO blobs VALUES (1, ?)", (binary_data,))
             conn.commit()
             
-            cursor = conn.execute("SELECT data FROM blobs WHERE id = 1")
-            retrieved = cursor.fetchone()[0]
+            # Stream the blob in chunks rather than materializing the value;
+            # small chunks so the 1 KB fixture spans several reads
+            hasher = hashlib.sha256()
+            with conn.blobopen("blobs", "data", 1, readonly=True) as blob:
+                size = len(blob)
+                while chunk := blob.read(256):
+                    hasher.update(chunk)
             conn.close()
             
-            self.assertEqual(retrieved, binary_data)
+            self.assertEqual(size, len(binary_data))
+            self.assertEqual(hasher.hexdigest(), hashlib.sha256(binary_data).hexdigest())
         finally:
             os.unlink(db_path)
     
@@ -791,9 +987,10 @@ class TestEdgeCaseResourceLimits(unittest.TestCase):
         operations = 1000
         
         for i in range(operations):
-            # Simulate quick operations
-            _ = json.dumps({"op": i})
-            _ = datetime.now().isoformat()
+            # Simulate quick operations; keep the raw clock reading and
+            # leave ISO formatting to report time
+            _ = dumps_compact({"op": i})
+            _ = time.time_ns()
         
         elapsed = time.time() - start
         ops_per_second = operations / elapsed
@@ -898,14 +1095,17 @@ class TestIntegrationWorkflows(unittest.TestCase):
         if device_connected:
             workflow_steps.append("device_verified")
         
-        # Step 3: Collect evidence
-        evidence = []
-        for item in ["contacts.db", "messages.db", "call_log.db"]:
-            evidence.append({
+        # Step 3: Collect evidence; the batch is collected in one pass, so
+        # a single timestamp snapshot stamps every item
+        collected_at = datetime.now().isoformat()
+        evidence = [
+            {
                 "file": item,
-                "collected_at": datetime.now().isoformat(),
+                "collected_at": collected_at,
                 "hash": "mock_hash_" + item
-            })
+            }
+            for item in ["contacts.db", "messages.db", "call_log.db"]
+        ]
         workflow_steps.append("evidence_collected")
         
         # Step 4: Generate report
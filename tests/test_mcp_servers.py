@@ -6,10 +6,18 @@ Tests for verifying MCP server functionality and tool availability.
 """
 
 import asyncio
+import hashlib
+import io
 import json
 import os
+import re
+import shlex
+import subprocess
 import sys
+import tarfile
+import tempfile
 import unittest
+from contextlib import contextmanager
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -18,6 +26,75 @@ PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 
+# Captured before tests patch subprocess.Popen
+_real_popen = subprocess.Popen
+
+
+def fake_adb_popen(stdout: bytes, stderr: bytes = b"", returncode: int = 0):
+    """Popen stand-in whose child process emits canned adb output and exit code.
+    stderr is the local adb client's own output (e.g. "error: device offline")."""
+    script = (
+        "import sys\n"
+        f"sys.stdout.buffer.write({stdout!r})\n"
+        f"sys.stderr.buffer.write({stderr!r})\n"
+        f"sys.exit({returncode})\n"
+    )
+
+    def popen(cmd, **kwargs):
+        return _real_popen([sys.executable, "-c", script], **kwargs)
+    return popen
+
+
+class FakeExecOutDevice:
+    """
+    Device behind `adb exec-out`: remote diagnostics are merged into the stdout stream
+    unless the command redirects them to a device-side file, which `cat` reads back.
+    """
+
+    def __init__(self, stdout: bytes, diagnostics: bytes = b"", returncode: int = 0):
+        self.stdout = stdout
+        self.diagnostics = diagnostics
+        self.returncode = returncode
+        self.files: dict[str, str] = {}
+
+    def popen(self, cmd, **kwargs):
+        redirect = re.search(r" 2>(\S+)$", cmd[-1])
+        if redirect:
+            self.files[shlex.split(redirect.group(1))[0]] = self.diagnostics.decode()
+            stdout = self.stdout
+        else:
+            stdout = self.stdout[:512] + self.diagnostics + self.stdout[512:]
+        return fake_adb_popen(stdout, returncode=self.returncode)(cmd, **kwargs)
+
+    def execute_adb_command(self, args, device_id=None, timeout=60):
+        command = args[-1]
+        if command == "su -c 'id'":
+            stdout = "uid=0(root) gid=0(root)"
+        else:
+            # "cat <err file> 2>/dev/null; rm -f <err file>"
+            stdout = self.files.pop(shlex.split(command)[1], "")
+        return {"stdout": stdout, "stderr": "", "returncode": 0, "success": True}
+
+    @contextmanager
+    def attached(self, module):
+        with patch.object(module.subprocess, "Popen", self.popen), \
+                patch.object(module, "execute_adb_command", self.execute_adb_command):
+            yield
+
+
+def build_tar(members: dict[str, tuple[bytes, int]], uid: int = 0) -> bytes:
+    """Tar stream of regular files owned by uid, mapping member name to (content, mode)."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        for name, (content, mode) in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mode = mode
+            info.uid = info.gid = uid
+            tar.addfile(info, io.BytesIO(content))
+    return buf.getvalue()
+
+
 class TestMCPServerImports(unittest.TestCase):
     """Test that all MCP server modules can be imported."""
     
@@ -195,6 +272,262 @@ class TestSystemForensicsTools(unittest.TestCase):
         self.assertEqual(date_part, "01-15")
         self.assertTrue(time_part.startswith("14:30:45"))
 
+    def test_parallel_probes_keyed_by_name(self):
+        """Test concurrent ADB probes return results keyed by probe name."""
+        from mcp_servers import system_forensics
+
+        def fake_adb(args, device_id=None, timeout=60):
+            return {"stdout": args[-1], "stderr": "", "returncode": 0, "success": True}
+
+        with patch.object(system_forensics, "execute_adb_command", side_effect=fake_adb):
+            results = system_forensics.execute_adb_commands_parallel({
+                "su": (["shell", "which su"], 10),
+                "tags": (["shell", "getprop ro.build.tags"], 10),
+            }, "SERIAL")
+
+        self.assertEqual(results["su"]["stdout"], "which su")
+        self.assertEqual(results["tags"]["stdout"], "getprop ro.build.tags")
+
+    def test_readonly_props_cached(self):
+        """Test ro.* properties are fetched once and mutable props expire."""
+        from mcp_servers import system_forensics
+
+        system_forensics.clear_device_prop_cache("SERIAL")
+        with patch.object(system_forensics, "execute_adb_command") as mock_adb, \
+                patch.object(system_forensics, "MUTABLE_PROP_TTL", 0):
+            mock_adb.return_value = {
+                "stdout": "[ro.debuggable]: [1]\n[net.dns1]: [8.8.8.8]\n",
+                "stderr": "", "returncode": 0, "success": True
+            }
+            for _ in range(3):
+                self.assertEqual(system_forensics.get_device_prop("ro.debuggable", "SERIAL"), "1")
+            self.assertEqual(mock_adb.call_count, 1)
+
+            self.assertEqual(system_forensics.get_device_prop("net.dns1", "SERIAL"), "8.8.8.8")
+            self.assertEqual(system_forensics.get_device_prop("net.dns1", "SERIAL"), "8.8.8.8")
+            self.assertEqual(mock_adb.call_count, 3)
+
+            system_forensics.clear_device_prop_cache("SERIAL")
+            system_forensics.get_device_prop("ro.debuggable", "SERIAL")
+            self.assertEqual(mock_adb.call_count, 4)
+
+            # ro.* values expire too, bounding staleness after a reflash
+            with patch.object(system_forensics, "RO_PROP_TTL", 0):
+                system_forensics.clear_device_prop_cache("SERIAL")
+                system_forensics.get_device_prop("ro.debuggable", "SERIAL")
+                system_forensics.get_device_prop("ro.debuggable", "SERIAL")
+            self.assertEqual(mock_adb.call_count, 6)
+
+    def test_default_device_props_keyed_by_serial(self):
+        """Test swapping the single attached device never serves the old device's props."""
+        from mcp_servers import system_forensics
+
+        attached = {"serial": "DEVICE1", "secure": "1"}
+
+        def fake_adb(args, device_id=None, timeout=60):
+            if args == ["get-serialno"]:
+                stdout = attached["serial"]
+            else:
+                self.assertEqual(device_id, attached["serial"])
+                stdout = f"[ro.secure]: [{attached['secure']}]\n"
+            return {"stdout": stdout, "stderr": "", "returncode": 0, "success": True}
+
+        system_forensics.clear_device_prop_cache()
+        with patch.object(system_forensics, "execute_adb_command", side_effect=fake_adb):
+            self.assertEqual(system_forensics.get_device_prop("ro.secure"), "1")
+            attached.update(serial="DEVICE2", secure="0")
+            self.assertEqual(system_forensics.get_device_prop("ro.secure"), "0")
+
+        # No device answers get-serialno: read live, cache nothing
+        gone = {"stdout": "", "stderr": "error: no devices/emulators found", "returncode": 1, "success": False}
+        with patch.object(system_forensics, "execute_adb_command", return_value=gone):
+            self.assertIsNone(system_forensics.get_device_prop("ro.secure"))
+
+    def test_unreachable_device_props_dropped(self):
+        """Test a failed getprop forgets the device's cached props for its reconnect."""
+        from mcp_servers import system_forensics
+
+        ok = {"stdout": "[ro.secure]: [1]\n", "stderr": "", "returncode": 0, "success": True}
+        offline = {"stdout": "", "stderr": "error: device offline", "returncode": 1, "success": False}
+        system_forensics.clear_device_prop_cache("SERIAL")
+        with patch.object(system_forensics, "execute_adb_command", side_effect=[ok, offline, ok]) as mock_adb:
+            system_forensics.get_device_prop("ro.secure", "SERIAL")
+            self.assertIsNone(system_forensics.get_device_prop("net.dns1", "SERIAL"))
+            self.assertEqual(system_forensics.get_device_prop("ro.secure", "SERIAL"), "1")
+        self.assertEqual(mock_adb.call_count, 3)
+
+    def test_props_batched_into_single_getprop(self):
+        """Test several properties are served by one getprop dump."""
+        from mcp_servers import system_forensics
+
+        system_forensics.clear_device_prop_cache("SERIAL")
+        with patch.object(system_forensics, "execute_adb_command") as mock_adb:
+            mock_adb.return_value = {
+                "stdout": "[ro.build.tags]: [test-keys]\n[ro.secure]: [0]\n[ro.boot.empty]: []\n",
+                "stderr": "", "returncode": 0, "success": True
+            }
+            props = system_forensics.get_device_props(
+                ["ro.build.tags", "ro.secure", "ro.boot.empty", "ro.debuggable"], "SERIAL"
+            )
+
+        mock_adb.assert_called_once_with(["shell", "getprop"], "SERIAL", timeout=15)
+        self.assertEqual(props, {
+            "ro.build.tags": "test-keys",
+            "ro.secure": "0",
+            "ro.boot.empty": "",
+            "ro.debuggable": "",
+        })
+
+    def test_empty_getprop_retried(self):
+        """Test a transient empty getprop dump is retried, not read as unset."""
+        from mcp_servers import system_forensics
+
+        empty = {"stdout": "", "stderr": "", "returncode": 0, "success": True}
+        full = {"stdout": "[ro.secure]: [1]\n", "stderr": "", "returncode": 0, "success": True}
+        system_forensics.clear_device_prop_cache("SERIAL")
+        with patch.object(system_forensics, "execute_adb_command", side_effect=[empty, full]) as mock_adb, \
+                patch.object(system_forensics.time, "sleep") as mock_sleep:
+            self.assertEqual(system_forensics.get_device_prop("ro.secure", "SERIAL"), "1")
+
+        self.assertEqual(mock_adb.call_count, 2)
+        mock_sleep.assert_called_once_with(system_forensics.GETPROP_RETRY_BASE)
+
+        system_forensics.clear_device_prop_cache("SERIAL")
+        with patch.object(system_forensics, "execute_adb_command", return_value=empty) as mock_adb, \
+                patch.object(system_forensics.time, "sleep"):
+            self.assertIsNone(system_forensics.get_device_prop("ro.secure", "SERIAL"))
+        self.assertEqual(mock_adb.call_count, system_forensics.GETPROP_ATTEMPTS)
+
+    def test_package_versions_from_single_dumpsys(self):
+        """Test versionName parsing stays within each package section."""
+        from mcp_servers import system_forensics
+
+        dumpsys = (
+            "Packages:\n"
+            "  Package [com.whatsapp] (a1b2c3):\n"
+            "    versionCode=221 minSdk=21 targetSdk=33\n"
+            "    versionName=2.23.10.76\n"
+            "    flags=[ HAS_CODE ALLOW_CLEAR_USER_DATA ]\n"
+            "  Package [com.noversion] (d4e5f6):\n"
+            "    versionCode=1\n"
+            "  Package [com.android.chrome] (789abc):\n"
+            "    versionName=120.0.6099.43\n"
+            "\n"
+            "Hidden system packages:\n"
+            "  Package [com.android.chrome] (def012):\n"
+            "    versionName=100.0.0\n"
+        )
+
+        versions = system_forensics.parse_package_versions(dumpsys)
+
+        self.assertEqual(versions, {
+            "com.whatsapp": "2.23.10.76",
+            "com.android.chrome": "120.0.6099.43",
+        })
+
+    def test_stream_command_to_file(self):
+        """Test command output is streamed to disk, counted and hashed."""
+        from mcp_servers import system_forensics
+
+        output = b"line one\nline two\nno trailing newline"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out_path = Path(tmpdir) / "logcat.txt"
+            with patch.object(system_forensics.subprocess, "Popen", fake_adb_popen(output)):
+                result = system_forensics.stream_adb_command_to_file(["logcat", "-d"], out_path, "SERIAL")
+            self.assertEqual(out_path.read_bytes(), output)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["line_count"], 3)
+        self.assertEqual(result["size_bytes"], len(output))
+        self.assertEqual(result["hash"], hashlib.sha256(output).hexdigest())
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            popen = fake_adb_popen(b"", b"error: device offline\n", 1)
+            with patch.object(system_forensics.subprocess, "Popen", popen):
+                result = system_forensics.stream_adb_command_to_file(["logcat"], Path(tmpdir) / "out.txt")
+        self.assertFalse(result["success"])
+        self.assertIn("device offline", result["stderr"])
+
+    def test_remote_tar_extracted_with_modes(self):
+        """Test tar members are extracted contained and defanged, with original modes in the manifest."""
+        from mcp_servers import system_forensics
+
+        stream = build_tar({
+            "xbin/su": (b"\x7fELF", 0o6755),
+            "xbin/notes.txt": (b"evidence", 0o666),
+            "../escape.txt": (b"outside", 0o644),
+        }, uid=10123)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            local_dir = Path(tmpdir) / "out"
+            local_dir.mkdir()
+            with FakeExecOutDevice(stream).attached(system_forensics):
+                result = system_forensics.stream_remote_tar("/system/xbin", local_dir, "SERIAL")
+
+            self.assertTrue(result["success"])
+            self.assertEqual(result["extracted_members"], 2)
+            self.assertEqual((local_dir / "xbin/su").stat().st_mode & 0o7777, 0o755)
+            self.assertEqual((local_dir / "xbin/notes.txt").stat().st_mode & 0o7777, 0o644)
+            self.assertEqual((local_dir / "xbin/su").stat().st_uid, os.geteuid())
+            self.assertEqual(result["manifest"], [
+                {"path": "xbin/su", "mode": "0o6755", "uid": 10123, "gid": 10123},
+                {"path": "xbin/notes.txt", "mode": "0o666", "uid": 10123, "gid": 10123},
+            ])
+            self.assertEqual([s["path"] for s in result["skipped_members"]], ["../escape.txt"])
+            self.assertFalse((Path(tmpdir) / "escape.txt").exists())
+            self.assertEqual(result["stream_hash"], hashlib.sha256(stream).hexdigest())
+            self.assertEqual(system_forensics.directory_stats(local_dir), (2, len(b"\x7fELF") + len(b"evidence")))
+
+    def test_remote_tar_failure_not_reported_as_success(self):
+        """Test a tar that archived nothing fails even though padding was streamed."""
+        from mcp_servers import system_forensics
+
+        padding = b"\0" * 10240
+        missing = b"tar: data/missing: No such file or directory\n"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # exec-out may not forward tar's exit code, so 0 must not imply success either
+            for returncode in (1, 0):
+                with FakeExecOutDevice(padding, missing, returncode).attached(system_forensics):
+                    result = system_forensics.stream_remote_tar("/data/missing", Path(tmpdir))
+                self.assertFalse(result["success"])
+                self.assertIn("No such file or directory", result["stderr"])
+
+            with FakeExecOutDevice(padding, missing, 1).attached(system_forensics):
+                result = system_forensics.extract_with_root("/data/missing", tmpdir, "SERIAL")
+        self.assertFalse(result["success"])
+        self.assertIn("No such file or directory", result["error"])
+
+    def test_remote_tar_diagnostics_kept_out_of_stream(self):
+        """Test tar warnings on the merged exec-out stream neither corrupt nor fail extraction."""
+        from mcp_servers import system_forensics
+
+        stream = build_tar({"app/databases/msgstore.db": (b"sqlite" * 200, 0o660)})
+        warning = b"tar: app/sock: socket ignored\n"
+        with tempfile.TemporaryDirectory() as tmpdir:
+            device = FakeExecOutDevice(stream, warning)
+            with device.attached(system_forensics):
+                result = system_forensics.extract_with_root("/data/data/app", tmpdir, "SERIAL")
+            self.assertEqual((Path(tmpdir) / "app/databases/msgstore.db").read_bytes(), b"sqlite" * 200)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["file_count"], 1)
+        self.assertEqual(result["tar_stream_sha256_hash"], hashlib.sha256(stream).hexdigest())
+        self.assertEqual(result["warnings"], warning.decode().strip())
+        self.assertEqual(device.files, {})
+
+    def test_directory_stats_counts_regular_files(self):
+        """Test directory_stats walks subdirectories and ignores symlinks."""
+        from mcp_servers import system_forensics
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            (root / "a" / "b").mkdir(parents=True)
+            (root / "top.db").write_bytes(b"1234")
+            (root / "a" / "mid.db").write_bytes(b"12")
+            (root / "a" / "b" / "deep.db").write_bytes(b"1")
+            (root / "a" / "link.db").symlink_to(root / "top.db")
+
+            self.assertEqual(system_forensics.directory_stats(root), (3, 7))
+
 
 class TestReportGeneratorTools(unittest.TestCase):
     """Test report generator MCP server tools."""
@@ -109,12 +109,10 @@ class TestPerformanceUnderLoad(unittest.TestCase):
         try:
             start = time.time()
             
-            # Stream hash (memory efficient)
-            hasher = hashlib.sha256()
+            # Stream hash (memory efficient); file_digest reads into a
+            # reused buffer in C instead of a Python-level chunk loop
             with open(large_file, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b''):
-                    hasher.update(chunk)
-            hash_value = hasher.hexdigest()
+                hash_value = hashlib.file_digest(f, "sha256").hexdigest()
             
             elapsed = time.time() - start
             